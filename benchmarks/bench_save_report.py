@@ -0,0 +1,80 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db_manager
+from utils.classes import Quiz, Question, Player, GameSession
+
+# End-of-game persist time vs player count.
+#   python benchmarks/bench_save_report.py [player counts...]
+# Compares the bulk save_full_report against the old one-INSERT-per-row loop
+# (kept below for reference), both on a throwaway database.
+QUESTIONS = 25
+RUNS = 3
+
+def build_session(n_players, n_questions=QUESTIONS):
+    questions = [Question(text=f"Question {i}?", options=["A", "B", "C", "D"], correct_indices=[i % 4]) for i in range(n_questions)]
+    session = GameSession(1, Quiz(name="Benchmark Quiz", creator_id=0, questions=questions))
+    rng = random.Random(n_players)
+    for uid in range(1, n_players + 1):
+        p = Player(user_id=uid, name=f"player{uid}", avatar_url="", join_time=1000.0, completion_timestamp=1300.0)
+        for q in range(n_questions):
+            correct = rng.random() < 0.6
+            pts = rng.randint(500, 1000) if correct else 0
+            p.answers_log.append({"q_index": q, "q_text": questions[q].text, "chosen": [rng.randint(0, 3)],
+                                  "chosen_text": "A", "is_correct": correct, "time": rng.uniform(1, 20), "points": pts})
+            p.score += pts
+            if correct: p.correct_answers += 1
+            else: p.incorrect_answers += 1
+        session.players[uid] = p
+    logs = [{"user_id": rng.randint(1, n_players), "name": "Double Points"} for _ in range(n_players // 2)]
+    return session, logs
+
+def legacy_save(c, session_obj, global_stats, powerup_logs):
+    c.execute('''INSERT INTO sessions (quiz_name, date_played, total_questions, total_players, completion_rate, avg_accuracy, results_sent)
+                 VALUES (?, ?, ?, ?, ?, ?, 0)''',
+              (session_obj.quiz.name, time.time(), len(session_obj.quiz.questions), len(session_obj.players), global_stats['completion_rate'], global_stats.get('avg_accuracy', 0.0)))
+    session_db_id = c.lastrowid
+    for p_log in powerup_logs:
+        c.execute("INSERT INTO powerup_usage (session_id, user_id, powerup_name) VALUES (?, ?, ?)", (session_db_id, p_log['user_id'], p_log['name']))
+    for rank, player in enumerate(sorted(session_obj.players.values(), key=lambda p: p.score, reverse=True), 1):
+        unattempted = len(session_obj.quiz.questions) - len(player.answers_log)
+        c.execute(db_manager.SQL_INSERT_PLAYER,
+                  (session_db_id, player.user_id, player.name, player.score, rank, player.correct_answers, player.incorrect_answers, unattempted, player.join_time, player.completion_timestamp, player.completion_timestamp - player.join_time))
+        player_db_id = c.lastrowid
+        for log in player.answers_log:
+            c.execute(db_manager.SQL_INSERT_ANSWER,
+                      (player_db_id, log['q_index'], log['q_text'], json.dumps(log['chosen']), log.get('chosen_text', ""), 1 if log['is_correct'] else 0, log['time'], log['points'],
+                       db_manager.question_key(session_obj.quiz.name, log['q_text'])))
+    return session_db_id
+
+def timed(func, *args):
+    best = float("inf")
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def main(counts):
+    tmp = tempfile.mkdtemp(prefix="quiz_bench_")
+    db_manager.close_db()
+    db_manager.DB_FILE = os.path.join(tmp, "bench.db")
+    db_manager.setup_database()
+    stats = {"completion_rate": 100.0, "avg_accuracy": 60.0}
+    print(f"{'players':>8} {'rows':>8} {'legacy ms':>10} {'bulk ms':>10} {'speedup':>8}")
+    for n in counts:
+        session, logs = build_session(n)
+        rows = 1 + len(logs) + n + n * QUESTIONS
+        legacy_ms = timed(lambda: db_manager.submit_write(legacy_save, session, stats, logs).result())
+        bulk_ms = timed(db_manager.save_full_report, session, stats, logs)
+        print(f"{n:>8} {rows:>8} {legacy_ms:>10.1f} {bulk_ms:>10.1f} {legacy_ms / bulk_ms:>7.1f}x")
+    db_manager.close_db()
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 50, 100, 250, 500])
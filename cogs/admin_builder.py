@@ -4,7 +4,8 @@ from discord.ext import commands
 import asyncio
 import os
 from utils.classes import Quiz, Question, QuestionType
-from utils.data_manager import save_quiz, load_quiz, get_quiz_lookup
+from utils import autocomplete, aio
+from utils.data_manager import save_quiz, flush_quiz_writes, quiz_filename
 
 ADMIN_IDS = [368792134645448704, 193855542366568448]
 
@@ -42,7 +43,7 @@ class QuestionSettingsModal(discord.ui.Modal, title="Extra Settings"):
             self.question_obj.weight = float(self.weight.value)
             self.question_obj.explanation = self.explanation.value if self.explanation.value.strip() else None
             
-            save_quiz(self.parent_view.quiz)
+            save_quiz(self.parent_view.quiz, defer=True)
             await interaction.response.send_message("✅ Settings updated!", ephemeral=True)
             if hasattr(self.parent_view, 'refresh_display'):
                 await self.parent_view.refresh_display(interaction)
@@ -105,7 +106,7 @@ class UpdateAnswerSelectionView(discord.ui.View):
         # OR that the list provided in the modal was already in the correct sequence.
         
         self.question_obj.allow_multi_select = len(self.question_obj.correct_indices) > 1
-        save_quiz(self.hub_view.quiz)
+        save_quiz(self.hub_view.quiz, defer=True)
         
         await interaction.response.edit_message(content="✅ **Updated!**", view=None)
         await self.hub_view.refresh_display(interaction)
@@ -144,7 +145,7 @@ class DeleteConfirmView(discord.ui.View):
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.index < len(self.parent_view.quiz.questions):
             self.parent_view.quiz.questions.pop(self.index)
-            save_quiz(self.parent_view.quiz)
+            save_quiz(self.parent_view.quiz, defer=True)
             await self.parent_view.hub_view.refresh_display(interaction)
             await interaction.response.edit_message(content="🗑️ **Deleted.**", view=None)
         else:
@@ -199,7 +200,7 @@ class AnswerSelectionView(discord.ui.View):
         )
         
         self.hub_view.quiz.questions.append(new_question)
-        save_quiz(self.hub_view.quiz)
+        save_quiz(self.hub_view.quiz, defer=True)
         
         await interaction.response.edit_message(content="✅ **Question Added!**", view=None, embed=None)
         await self.hub_view.refresh_display(interaction)
@@ -263,6 +264,8 @@ class QuizEditorHub(discord.ui.View):
 
     @discord.ui.button(label="Close", style=discord.ButtonStyle.secondary)
     async def save_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # End of the editing session: commit any coalesced edits now
+        await aio.flush_quiz_writes(quiz_filename(self.quiz))
         await interaction.response.edit_message(content="✅ **Closed.**", view=None, embed=None)
     async def refresh_display(self, interaction=None):
         self.refresh_components()
@@ -354,7 +357,7 @@ class EditorControls(discord.ui.View):
             await msg.attachments[0].save(local_path)
             
             self.q.image_url = local_path
-            save_quiz(self.quiz)
+            save_quiz(self.quiz, defer=True)
             
             try: await msg.delete()
             except: pass
@@ -379,13 +382,10 @@ class EditorControls(discord.ui.View):
 class QuizBuilder(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+    def cog_unload(self):
+        flush_quiz_writes()
     async def quiz_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        quiz_map = get_quiz_lookup()
-        choices = []
-        for real_name, filename in quiz_map.items():
-            if current.lower() in real_name.lower():
-                choices.append(app_commands.Choice(name=real_name, value=filename))
-        return choices[:25]
+        return [app_commands.Choice(name=real_name, value=filename) for real_name, filename in await aio.search("quizzes", current)]
     @app_commands.command(name="manage_quiz", description="Create or Edit a quiz")
     @app_commands.describe(mode="Choose Create to make new, Edit to modify existing")
     @app_commands.describe(name="The name of the quiz (Select existing for Edit, type new for Create)")
@@ -395,13 +395,15 @@ class QuizBuilder(commands.Cog):
         if not is_hardcoded_admin(interaction):
             await interaction.response.send_message("⛔ Admin Only.", ephemeral=True)
             return
-        quiz = load_quiz(name)
+        # Editor mutates the quiz in place, so never hand it the shared cached instance
+        quiz = await aio.load_quiz(name, editable=True)
         if mode == "create":
             if quiz:
                 await interaction.response.send_message(f"⚠️ **{name}** exists! Edit?", ephemeral=True)
                 return
             quiz = Quiz(name=name, creator_id=interaction.user.id)
-            save_quiz(quiz)
+            await aio.save_quiz(quiz)
+            autocomplete.invalidate("quizzes")
             msg = f"🆕 **Created:** {name}"
         else:
             if not quiz:
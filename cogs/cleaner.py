@@ -1,8 +1,7 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.data_manager import get_quiz_lookup, delete_quiz_file
-from utils.db_manager import get_session_lookup, delete_session, delete_sessions_range
+from utils import autocomplete, aio
 
 ADMIN_IDS = [368792134645448704, 193855542366568448]
 SERVER_ID = 238080556708003851
@@ -65,8 +64,9 @@ class MultiQuizDeleteView(discord.ui.View):
         
         count = 0
         for name in self.select.values:
-            if delete_quiz_file(name):
+            if await aio.delete_quiz_file(name):
                 count += 1
+        autocomplete.invalidate("quizzes")
         
         self.stop()
         # Edit the ORIGINAL message (the menu) to show results
@@ -80,20 +80,10 @@ class Cleaner(commands.Cog):
         self.group = app_commands.Group(name="clear", description="Deletion tools for Quizzes and History")
 
     async def quiz_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        quiz_map = get_quiz_lookup()
-        choices = []
-        for real_name, filename in quiz_map.items():
-            if current.lower() in real_name.lower():
-                choices.append(app_commands.Choice(name=real_name, value=real_name))
-        return choices[:25]
+        return [app_commands.Choice(name=real_name, value=real_name) for real_name, _ in await aio.search("quizzes", current)]
 
     async def session_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[int]]:
-        sessions = get_session_lookup(limit=25)
-        choices = []
-        for s in sessions:
-            if current.lower() in s['label'].lower():
-                choices.append(app_commands.Choice(name=s['label'], value=s['id']))
-        return choices[:25]
+        return [app_commands.Choice(name=label, value=sid) for label, sid in await aio.search("sessions", current)]
 
     # 1. DELETE SPECIFIC QUIZ
     @app_commands.command(name="quiz", description="Delete a specific quiz file")
@@ -114,7 +104,8 @@ class Cleaner(commands.Cog):
         await view.wait()
         
         if view.value:
-            if delete_quiz_file(name):
+            if await aio.delete_quiz_file(name):
+                autocomplete.invalidate("quizzes")
                 # STEP 3: Replace prompt with result
                 await interaction.edit_original_response(content=f"✅ Deleted **{name}**.", view=None)
             else:
@@ -139,7 +130,9 @@ class Cleaner(commands.Cog):
         await view.wait()
 
         if view.value:
-            delete_session(session_id)
+            await aio.delete_session(session_id)
+            autocomplete.invalidate("sessions")
+            autocomplete.invalidate("session_count")
             await interaction.edit_original_response(content=f"✅ Deleted Session **{session_id}**.", view=None)
         else:
             await interaction.edit_original_response(content="❌ Cancelled.", view=None)
@@ -153,7 +146,7 @@ class Cleaner(commands.Cog):
             await interaction.edit_original_response(content="⛔ Admin Only.")
             return
 
-        quiz_map = get_quiz_lookup()
+        quiz_map = await aio.get_quiz_lookup()
         if not quiz_map:
             await interaction.edit_original_response(content="No quizzes found.")
             return
@@ -181,7 +174,9 @@ class Cleaner(commands.Cog):
         await view.wait()
 
         if view.value:
-            count = delete_sessions_range(start_id, end_id)
+            count = await aio.delete_sessions_range(start_id, end_id)
+            autocomplete.invalidate("sessions")
+            autocomplete.invalidate("session_count")
             await interaction.edit_original_response(content=f"✅ Deleted **{count}** sessions (and related data).", view=None)
         else:
             await interaction.edit_original_response(content="❌ Cancelled.", view=None)
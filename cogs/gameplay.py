@@ -6,19 +6,17 @@ import time
 import random
 import os
 import json
-from utils.classes import Quiz, Question, Player, GameSession, CustomPowerUp, EffectType, QuestionType
-from utils.data_manager import load_quiz, load_powerups, get_quiz_lookup
+import tempfile
+import threading
+from utils.classes import Quiz, Question, CompiledQuestion, Player, GameSession, EffectType, QuestionType
+from utils.data_manager import get_quiz_cache_stats, get_powerup_registry, get_powerup
 import io
 from PIL import Image, ImageDraw, ImageFont 
 
-from utils.db_manager import (
-    save_full_report, get_recent_sessions, get_session_details, 
-    get_total_session_count, get_session_ids_by_limit, 
-    get_leaderboard_data, get_roundup_data, get_session_lookup,
-    get_history_page, check_results_sent, mark_results_sent,
-    log_moderation_action, ban_user_db, unban_user_db, check_is_banned, get_moderation_history,
-    get_user_last_quiz_stats, adjust_session_question 
-)
+from utils import autocomplete, aio, asset_cache
+from utils.scheduler import DeadlineScheduler
+from utils.dispatch import EditQueue
+from utils.db_manager import check_is_banned, get_writer_stats, check_query_plans, build_report_rows
 
 
 ADMIN_IDS = [368792134645448704, 193855542366568448]
@@ -163,16 +161,50 @@ def is_privileged(interaction: discord.Interaction) -> bool:
             
     return False
 STATE_FILE = "data/active_sessions.json"
+_state_write_lock = threading.Lock() # unload save vs. an autosave still on the I/O pool
 
 
 active_sessions = {}
 
+# Question timeouts and power-play expiry, fired by Gameplay.check_timeouts.
+# Keys: ("question", channel_id, user_id) and ("powerplay", channel_id).
+deadlines = DeadlineScheduler()
+POWERPLAY_DURATION = 20
+
+# All non-interaction edits of player boards (push updates, "Time's Up") go
+# through one coalescing queue keyed per board, so nothing awaits Discord inline
+# and overlapping broadcasts collapse to one edit. Interaction responses bypass it.
+BOARD_EDIT_CONCURRENCY = 8
+board_edits = EditQueue(BOARD_EDIT_CONCURRENCY)
+timeout_stats = {"ticks": 0, "last_expired": 0, "max_expired": 0, "total_expired": 0, "last_tick_ms": 0.0}
+
+# Live dashboard / admin lobby refresh (see Gameplay.dashboard_update)
+DASHBOARD_TICK = 1
+DASHBOARD_MIN_INTERVAL = 3
+DASHBOARD_MAX_INTERVAL = 15
+STATE_SAVE_INTERVAL = 5
+
 # --- HELPERS ---
 
+def schedule_question_timeout(session: GameSession, player: Player):
+    # Call whenever a question is shown / answered or TIME_FREEZE changes
+    key = ("question", session.channel_id, player.user_id)
+    if (player.completed or player.current_q_timestamp == 0 or player.current_q_index >= len(player.question_order)
+            or any(p.effect == EffectType.TIME_FREEZE for p in player.active_powerups)):
+        deadlines.cancel(key)
+        return
+    q = session.quiz.questions[player.question_order[player.current_q_index]]
+    deadlines.schedule(key, player.current_q_timestamp + q.time_limit + 1)
+
+def start_powerplay(session: GameSession):
+    session.global_powerplay_end = time.time() + POWERPLAY_DURATION
+    session.global_powerplay_active = True
+    deadlines.schedule(("powerplay", session.channel_id), session.global_powerplay_end)
+
 def register_new_player(session: GameSession, user: discord.User) -> Player:
     if user.id in session.players:
         return session.players[user.id]
-    all_powerups = load_powerups()
+    all_powerups = get_powerup_registry().powerups
     starter = random.sample(all_powerups, min(3, len(all_powerups))) if all_powerups else []
     new_player = Player(
         user_id=user.id, name=user.display_name, avatar_url=user.display_avatar.url, inventory=starter
@@ -182,7 +214,7 @@ def register_new_player(session: GameSession, user: discord.User) -> Player:
     random.shuffle(order)
     new_player.question_order = order
     new_player.join_time = time.time()
-    session.players[user.id] = new_player
+    session.add_player(new_player)
     return new_player
 
 def glitch_text(text: str) -> str:
@@ -192,11 +224,18 @@ def glitch_text(text: str) -> str:
             chars[i] = random.choice(["#", "$", "%", "&", "@", "?", "!", "0", "1"])
     return "".join(chars)
 
-def build_game_embed(player: Player, question: Question, question_num: int, rank_str: str, current_sequence=None, glitch_active=False, powerplay_active=False) -> tuple[discord.Embed, str, discord.File]:
+# Returned instead of a File when a re-render should leave the message's upload alone
+KEEP_ATTACHMENT = object()
+
+def board_attachments(file) -> dict:
+    # Edit kwargs for a board render: KEEP_ATTACHMENT omits `attachments` so nothing is re-sent
+    if file is KEEP_ATTACHMENT: return {}
+    return {"attachments": [file] if file else []}
+
+def build_game_embed(player: Player, question: Question, question_num: int, rank_str: str, current_sequence=None, glitch_active=False, powerplay_active=False, same_question=False) -> tuple[discord.Embed, str, discord.File]:
+    question = CompiledQuestion.from_question(question) # no-op for quizzes from load_quiz
     q_text = question.text
-    type_text = ""
-    if question.type == QuestionType.REORDER: type_text = "(Order Sequence)"
-    elif question.allow_multi_select: type_text = "(Multi-Select)"
+    type_text = question.type_text
     
     if glitch_active:
         q_text = glitch_text(q_text)
@@ -207,25 +246,24 @@ def build_game_embed(player: Player, question: Question, question_num: int, rank
     embed = discord.Embed(title=f"Q{question_num} {type_text}", color=0x00ff00)
     embed.set_author(name=f"Score: {player.score} pts | Rank: {rank_str}", icon_url=player.avatar_url or None)
     
-    # [FIX] Handle Images (URL vs Local File)
+    # [FIX] Handle Images (URL vs Local File) - resolved once at quiz load
+    # (missing files are reported there, not on every render)
     file_attachment = None
-    if question.image_url:
-        # 1. Web URL
-        if question.image_url.lower().startswith(("http://", "https://")):
-            embed.set_image(url=question.image_url)
-        # 2. Local File
-        elif os.path.exists(question.image_url):
-            # [CRITICAL FIX] Use a safe, generic filename for the attachment protocol.
-            # This avoids issues with spaces/special chars in your local filenames.
-            ext = os.path.splitext(question.image_url)[1]
-            if not ext: ext = ".png"
-            safe_filename = f"quiz_image{ext}"
-            
-            file_attachment = discord.File(question.image_url, filename=safe_filename)
-            embed.set_image(url=f"attachment://{safe_filename}")
+    if question.image_kind == "url":
+        embed.set_image(url=question.image_url)
+    elif question.image_kind == "file":
+        # Uploaded once to the asset channel -> just reference the CDN URL
+        cdn_url = asset_cache.get_url(question.image_path, allow_stale=same_question)
+        if cdn_url:
+            embed.set_image(url=cdn_url)
+        elif same_question:
+            # Board already carries this question's upload, point at it again
+            file_attachment = KEEP_ATTACHMENT
+            embed.set_image(url=f"attachment://{question.image_filename}")
         else:
-            # [DEBUG] Print warning if file is missing so you can fix the path
-            print(f"⚠️ [WARNING] Image not found at path: {question.image_url}")
+            file_attachment = discord.File(question.image_path, filename=question.image_filename)
+            embed.set_image(url=f"attachment://{question.image_filename}")
+            asset_cache.schedule(question.image_path, question.image_filename)
 
     desc = ""
     if glitch_active: desc += "# 👾 YOU’VE BEEN GLITCHED! 👾\n\n"
@@ -271,14 +309,22 @@ def build_game_embed(player: Player, question: Question, question_num: int, rank
         
     return embed, content_str, file_attachment
 
-async def push_update_to_player(session: GameSession, player: Player, glitch=False):
+def board_key(session: GameSession, player: Player):
+    return ("board", session.channel_id, player.user_id)
+
+def push_update_to_player(session: GameSession, player: Player, glitch=False, priority=False):
+    # Queue a re-render of the player's board; pending pushes for the same board
+    # collapse into the latest one. Rendered at send time, so it shows current state.
     if not player.board_message: return
+    board_edits.submit(board_key(session, player), lambda: _send_board_update(session, player, glitch), priority)
+
+async def _send_board_update(session: GameSession, player: Player, glitch=False):
+    # Nothing to refresh between questions (intermission) or after the last one
+    if not player.board_message or player.completed or player.current_q_timestamp == 0: return
     try:
         real_idx = player.question_order[player.current_q_index]
         q = session.quiz.questions[real_idx]
-        sorted_players = sorted(session.players.values(), key=lambda p: p.score, reverse=True)
-        try: rank = sorted_players.index(player) + 1
-        except: rank = 0
+        rank = session.rank_of(player)
 
         cur_seq = player.view_state.get('reorder')
 
@@ -286,13 +332,12 @@ async def push_update_to_player(session: GameSession, player: Player, glitch=Fal
         embed, content, file = build_game_embed(
             player, q, player.current_q_index + 1, f"#{rank}", 
             current_sequence=cur_seq, glitch_active=glitch,
-            powerplay_active=session.global_powerplay_active 
+            powerplay_active=session.global_powerplay_active, same_question=True
         )
-        
-        # [CHANGE] Pass attachments (clears old ones, sets new one if exists)
-        atts = [file] if file else []
-        await player.board_message.edit(content=content or None, embed=embed, attachments=atts)
-    except: pass
+    except: return
+    # [CHANGE] Same question -> keep the existing attachment instead of re-uploading
+    # (HTTP errors propagate so the edit queue can retry 429s)
+    await player.board_message.edit(content=content or None, embed=embed, **board_attachments(file))
 
 async def open_board_logic(interaction: discord.Interaction, session: GameSession, player: Player):
     if player.completed:
@@ -300,10 +345,7 @@ async def open_board_logic(interaction: discord.Interaction, session: GameSessio
         return
     real_idx = player.question_order[player.current_q_index]
     q1 = session.quiz.questions[real_idx]
-    sorted_players = sorted(session.players.values(), key=lambda p: p.score, reverse=True)
-    try: rank = sorted_players.index(player) + 1
-    except: rank = 0
-    rank_str = f"#{rank}"
+    rank_str = f"#{session.rank_of(player)}"
     
     embed, content, file = build_game_embed(player, q1, player.current_q_index + 1, rank_str, powerplay_active=session.global_powerplay_active)
     
@@ -337,7 +379,7 @@ async def finish_game_logic(session: GameSession, interaction: discord.Interacti
     session.bump_mode = None 
     if interaction.response.is_done(): await interaction.followup.send("🛑 **Stopping Game...**", ephemeral=True)
     else: await interaction.response.send_message("🛑 **Stopping Game...**", ephemeral=True)
-    sorted_players = sorted(session.players.values(), key=lambda p: p.score, reverse=True)
+    sorted_players = session.top_players()
     total_players = len(sorted_players)
     total_attempts = sum(len(p.answers_log) for p in sorted_players)
     total_correct = sum(p.correct_answers for p in sorted_players)
@@ -345,14 +387,19 @@ async def finish_game_logic(session: GameSession, interaction: discord.Interacti
     comp_rate = total_attempts / total_possible if total_possible > 0 else 0
     avg_acc = total_correct / total_attempts if total_attempts > 0 else 0
     p_log = getattr(session, 'powerup_usage_log', [])
-    sess_id = save_full_report(session, {"completion_rate": comp_rate, "avg_accuracy": avg_acc}, p_log)
+    # Rows are built here on the loop (no await in between), so the report is one
+    # consistent snapshot even though the insert runs later on the writer thread
+    report = build_report_rows(session, {"completion_rate": comp_rate, "avg_accuracy": avg_acc}, p_log)
+    sess_id = await aio.save_report_rows(report)
+    autocomplete.invalidate("sessions")
+    autocomplete.invalidate("session_count")
     for attr in ['lobby_msg', 'dashboard_msg', 'connector_msg']:
         msg = getattr(session, attr, None)
         if msg:
             try: await msg.delete()
             except: pass
             setattr(session, attr, None) 
-    s_data, p_data, q_data = get_session_details(sess_id)
+    s_data, p_data, q_data = await aio.get_session_details(sess_id)
     view = ReportNavigator(s_data, p_data, q_data)
     await interaction.followup.send(embed=view.get_embed(), view=view, ephemeral=True)
     try:
@@ -380,6 +427,7 @@ async def do_bump(session: GameSession, channel):
     dashboard_view = LiveDashboardView(session)
     embed = discord.Embed(title="📊 Live Leaderboard", description="Refreshing...", color=0xFFD700)
     session.dashboard_msg = await channel.send(embed=embed, view=dashboard_view)
+    session.dashboard_next = 0 # new message -> fill it on the next tick
     session.connector_msg = await channel.send("🚀 **Game is Live!**", view=StartConnector(session))
 
 # --- VIEWS ---
@@ -395,7 +443,7 @@ class ResultsConfirmation(discord.ui.View):
     @discord.ui.button(label="Confirm & Send", style=discord.ButtonStyle.green)
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
         await self.target_channel.send(self.final_content)
-        mark_results_sent(self.session_id)
+        await aio.mark_results_sent(self.session_id)
         await interaction.response.edit_message(content=f"✅ Sent to {self.target_channel.mention}!", view=None)
         bg_str = " ".join([str(uid) for uid in self.background_ids])
         tr_str = " ".join([str(uid) for uid in self.trophy_ids])
@@ -423,40 +471,44 @@ class HistorySessionSelect(discord.ui.Select):
         super().__init__(placeholder="Select a session to view report...", options=options)
     async def callback(self, interaction: discord.Interaction):
         sess_id = int(self.values[0])
-        s_data, p_data, q_data = get_session_details(sess_id)
+        s_data, p_data, q_data = await aio.get_session_details(sess_id)
         if not s_data: return
         nav_view = ReportNavigator(s_data, p_data, q_data)
         await interaction.response.send_message(embed=nav_view.get_embed(), view=nav_view, ephemeral=True)
 
 class HistoryPaginationView(discord.ui.View):
+    # Call (and await) update_components() before sending the view
     def __init__(self):
         super().__init__(timeout=600)
-        self.page = 0
         self.limit = 25
-        self.update_components()
-    def update_components(self):
+        # Keyset cursors: cursors[i] is the before_id of page i (None = newest)
+        self.cursors = [None]
+        self.next_cursor = None
+    @property
+    def page(self):
+        return len(self.cursors) - 1
+    async def update_components(self):
         self.clear_items()
-        offset = self.page * self.limit
-        sessions = get_history_page(self.limit, offset)
+        sessions, has_more = await aio.get_history_page(self.limit, self.cursors[-1])
+        self.next_cursor = sessions[-1]['session_id'] if sessions else None
         if sessions: self.add_item(HistorySessionSelect(sessions))
         prev_btn = discord.ui.Button(label="◀️ Newer", style=discord.ButtonStyle.primary, disabled=(self.page == 0), row=1)
         prev_btn.callback = self.prev_page
         self.add_item(prev_btn)
-        next_sessions = get_history_page(1, (self.page + 1) * self.limit)
-        next_btn = discord.ui.Button(label="Older ▶️", style=discord.ButtonStyle.primary, disabled=(len(next_sessions) == 0), row=1)
+        next_btn = discord.ui.Button(label="Older ▶️", style=discord.ButtonStyle.primary, disabled=not has_more, row=1)
         next_btn.callback = self.next_page
         self.add_item(next_btn)
-        total = get_total_session_count()
-        max_p = (total + self.limit - 1) // self.limit
+        total = await aio.get_cached("session_count")
+        max_p = max(1, (total + self.limit - 1) // self.limit, self.page + 1)
         lbl = discord.ui.Button(label=f"Page {self.page + 1}/{max_p}", style=discord.ButtonStyle.secondary, disabled=True, row=1)
         self.add_item(lbl)
     async def prev_page(self, interaction):
-        self.page -= 1
-        self.update_components()
+        if len(self.cursors) > 1: self.cursors.pop()
+        await self.update_components()
         await interaction.response.edit_message(view=self)
     async def next_page(self, interaction):
-        self.page += 1
-        self.update_components()
+        if self.next_cursor is not None: self.cursors.append(self.next_cursor)
+        await self.update_components()
         await interaction.response.edit_message(view=self)
 
 class LeaderboardView(discord.ui.View):
@@ -657,12 +709,10 @@ class IntermissionView(discord.ui.View):
         real_idx = self.player.question_order[self.player.current_q_index]
         next_q = self.session.quiz.questions[real_idx]
         
-        sorted_players = sorted(self.session.players.values(), key=lambda p: p.score, reverse=True)
-        try: rank = sorted_players.index(self.player) + 1
-        except: rank = 0
-        rank_str = f"#{rank}"
+        rank_str = f"#{self.session.rank_of(self.player)}"
         
         self.player.current_q_timestamp = time.time()
+        schedule_question_timeout(self.session, self.player)
         
         # Build the new board
         embed, content, file = build_game_embed(
@@ -687,6 +737,10 @@ class StartConnector(discord.ui.View):
         self.session = session
     @discord.ui.button(label="Open Game Board", style=discord.ButtonStyle.green)
     async def open(self, interaction, button):
+        # The end-of-game report is snapshotted when is_running goes False; no late joins
+        if not self.session.is_running:
+            await interaction.response.send_message("🛑 **This game has ended.**", ephemeral=True)
+            return
         if check_is_banned(interaction.user.id):
             await interaction.response.send_message("⛔ **You are banned from Trivia.**", ephemeral=True)
             return
@@ -718,10 +772,9 @@ class LiveDashboardView(discord.ui.View):
         if interaction.user.id not in self.session.players:
             await interaction.response.send_message("You are not in this game.", ephemeral=True)
             return
-        sorted_players = sorted(self.session.players.values(), key=lambda p: p.score, reverse=True)
         player = self.session.players[interaction.user.id]
-        rank = sorted_players.index(player) + 1
-        total = len(sorted_players)
+        rank = self.session.rank_of(player)
+        total = len(self.session.players)
         await interaction.response.send_message(f"🏅 **Your Rank:** #{rank} / {total}\n**Score:** {player.score} pts\n**Streak:** {player.streak} 🔥", ephemeral=True)
     @discord.ui.button(label="End Game (Admin)", style=discord.ButtonStyle.danger, row=1)
     async def end_game(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -749,8 +802,14 @@ class LobbyView(discord.ui.View):
         super().__init__(timeout=None)
         self.session = session
         self.show_ids = False
+        self.rendered_sig = None
+
+    def signature(self):
+        # Everything get_embed shows; dashboard_update skips the edit if unchanged
+        return (self.show_ids, tuple((p.user_id, p.name) for p in self.session.players.values()))
 
     def get_embed(self):
+        self.rendered_sig = self.signature()
         title = "👥 Admin Player Lobby"
         if not self.session.players:
             desc = "No players yet."
@@ -804,16 +863,14 @@ class GameView(discord.ui.View):
         if player.current_q_timestamp == 0.0:
             player.current_q_timestamp = time.time()
         self.question_start_time = player.current_q_timestamp
+        schedule_question_timeout(session, player)
         
         if self.current_q:
              self.setup_answer_buttons()
              self.setup_powerup_buttons()
 
     def get_rank_str(self):
-        sorted_players = sorted(self.session.players.values(), key=lambda p: p.score, reverse=True)
-        try: rank = sorted_players.index(self.player) + 1
-        except: rank = 0
-        return f"#{rank}"
+        return f"#{self.session.rank_of(self.player)}"
 
     def save_view_state(self):
         self.player.view_state = {
@@ -844,10 +901,10 @@ class GameView(discord.ui.View):
         for i in range(len(self.displayed_to_original_map)):
             orig_idx = self.displayed_to_original_map[i]
             if orig_idx < len(self.current_q.options):
-                shuffled_options.append((orig_idx, self.current_q.options[orig_idx]))
+                shuffled_options.append((orig_idx, self.current_q.option_labels[orig_idx]))
 
         labels = ["A", "B", "C", "D", "E"]
-        wrong_indices = [i for i, _ in enumerate(self.current_q.options) if i not in self.current_q.correct_indices]
+        wrong_indices = self.current_q.wrong_indices
         
         disabled_original_indices = []
         for p in self.player.active_powerups:
@@ -869,7 +926,7 @@ class GameView(discord.ui.View):
             elif self.current_q.allow_multi_select:
                 if i in self.current_selections: style = discord.ButtonStyle.success
             
-            btn = discord.ui.Button(label=f"{labels[i]}: {text[:75]}", style=style, custom_id=custom_id, row=0 if i < 3 else 1, disabled=is_disabled)
+            btn = discord.ui.Button(label=f"{labels[i]}: {text}", style=style, custom_id=custom_id, row=0 if i < 3 else 1, disabled=is_disabled)
             btn.callback = self.answer_callback
             self.add_item(btn)
             
@@ -905,9 +962,17 @@ class GameView(discord.ui.View):
             return False
         return True
 
+    async def check_running(self, interaction):
+        # No answers / powerups after the game ended (the report is already snapshotted)
+        if not self.session.is_running:
+            await interaction.response.send_message("🛑 **This game has ended.**", ephemeral=True)
+            return False
+        return True
+
     async def powerup_callback(self, interaction):
         if self.restored: return await self.handle_restored(interaction)
         if not await self.check_ownership(interaction): return
+        if not await self.check_running(interaction): return
         if len(self.player.active_powerups) > 0:
             await interaction.response.send_message("❌ One powerup per turn!", ephemeral=True)
             return
@@ -924,20 +989,23 @@ class GameView(discord.ui.View):
         self.player.active_powerups.append(selected_powerup)
         self.session.powerup_usage_log.append({'user_id': self.player.user_id, 'name': selected_powerup.name})
         
-        if selected_powerup.effect == EffectType.POWER_PLAY:
-            self.session.global_powerplay_end = time.time() + 20
-            self.session.global_powerplay_active = True
+        if selected_powerup.effect == EffectType.TIME_FREEZE:
+            schedule_question_timeout(self.session, self.player)
+        elif selected_powerup.effect == EffectType.POWER_PLAY:
+            start_powerplay(self.session)
+            # Our own board is re-rendered by this interaction's response below
             for p in self.session.players.values():
-                asyncio.create_task(push_update_to_player(self.session, p))
+                if p.user_id != self.player.user_id:
+                    push_update_to_player(self.session, p)
         elif selected_powerup.effect == EffectType.GLITCH:
             for p in self.session.players.values():
                 if p.user_id != self.player.user_id:
-                    asyncio.create_task(push_update_to_player(self.session, p, glitch=True))
+                    push_update_to_player(self.session, p, glitch=True)
             async def revert():
                 await asyncio.sleep(10)
                 for p in self.session.players.values():
                     if p.user_id != self.player.user_id:
-                        asyncio.create_task(push_update_to_player(self.session, p, glitch=False))
+                        push_update_to_player(self.session, p, glitch=False)
             asyncio.create_task(revert())
             
         # --- FIX: SAVE STATUS TO LOG ---
@@ -949,13 +1017,12 @@ class GameView(discord.ui.View):
         self.setup_answer_buttons()
         self.setup_powerup_buttons()
         # [CHANGE] Unpack
-        new_embed, content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, self.get_rank_str(), powerplay_active=self.session.global_powerplay_active)
+        new_embed, content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, self.get_rank_str(), powerplay_active=self.session.global_powerplay_active, same_question=True)
         
         final_msg = f"{self.status_log}\n{content}".strip()
         
-        # [CHANGE] Edit with attachments
-        atts = [file] if file else []
-        await interaction.response.edit_message(content=final_msg or None, embed=new_embed, view=self, attachments=atts)
+        # [CHANGE] Edit with attachments (kept as-is for the same question)
+        await interaction.response.edit_message(content=final_msg or None, embed=new_embed, view=self, **board_attachments(file))
 
     async def reset_callback(self, interaction):
         if self.restored: return await self.handle_restored(interaction) 
@@ -966,17 +1033,17 @@ class GameView(discord.ui.View):
         self.setup_answer_buttons()
         self.setup_powerup_buttons()
         # [CHANGE] Unpack
-        new_embed, content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, self.get_rank_str(), powerplay_active=self.session.global_powerplay_active)
+        new_embed, content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, self.get_rank_str(), powerplay_active=self.session.global_powerplay_active, same_question=True)
         
         final_msg = f"{self.status_log}\n{content}".strip()
         
-        # [CHANGE] Edit with attachments
-        atts = [file] if file else []
-        await interaction.response.edit_message(content=final_msg or None, embed=new_embed, view=self, attachments=atts)
+        # [CHANGE] Edit with attachments (kept as-is for the same question)
+        await interaction.response.edit_message(content=final_msg or None, embed=new_embed, view=self, **board_attachments(file))
 
     async def answer_callback(self, interaction):
         if self.restored: return await self.handle_restored(interaction) 
         if not await self.check_ownership(interaction): return
+        if not await self.check_running(interaction): return
         
         # [FIX] Handle late click (Already answered/Timeout)
         if self.player.current_q_timestamp == 0:
@@ -998,11 +1065,11 @@ class GameView(discord.ui.View):
                 rank_str = self.get_rank_str()
                 
                 # [CHANGE] Build embed and content
-                embed, q_content = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, rank_str, current_sequence=self.reorder_sequence, powerplay_active=self.session.global_powerplay_active)
+                embed, q_content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, rank_str, current_sequence=self.reorder_sequence, powerplay_active=self.session.global_powerplay_active, same_question=True)
                 
                 # [CHANGE] Combine status log and question content
                 final_content = f"{self.status_log}\n{q_content}".strip()
-                await interaction.response.edit_message(content=final_content or None, embed=embed, view=self)
+                await interaction.response.edit_message(content=final_content or None, embed=embed, view=self, **board_attachments(file))
         elif self.current_q.allow_multi_select:
             if clicked_display_idx in self.current_selections: self.current_selections.remove(clicked_display_idx)
             else: self.current_selections.add(clicked_display_idx)
@@ -1013,19 +1080,19 @@ class GameView(discord.ui.View):
             self.setup_powerup_buttons()
             
             # [CHANGE] Unpack
-            new_embed, content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, self.get_rank_str(), powerplay_active=self.session.global_powerplay_active)
+            new_embed, content, file = build_game_embed(self.player, self.current_q, self.player.current_q_index + 1, self.get_rank_str(), powerplay_active=self.session.global_powerplay_active, same_question=True)
         
             final_msg = f"{self.status_log}\n{content}".strip()
         
-        # [CHANGE] Edit with attachments
-            atts = [file] if file else []
-            await interaction.response.edit_message(content=final_msg or None, embed=new_embed, view=self, attachments=atts)
+            # [CHANGE] Edit with attachments (kept as-is for the same question)
+            await interaction.response.edit_message(content=final_msg or None, embed=new_embed, view=self, **board_attachments(file))
         else:
             await self.process_submission(interaction, [clicked_display_idx])
 
     async def submit_callback(self, interaction):
         if self.restored: return await self.handle_restored(interaction) 
         if not await self.check_ownership(interaction): return
+        if not await self.check_running(interaction): return
         
         # [FIX] Handle late click
         if self.player.current_q_timestamp == 0:
@@ -1043,10 +1110,9 @@ class GameView(discord.ui.View):
     async def process_submission(self, interaction, selected_display_indices, reorder_final=None):
         if reorder_final is not None:
             orig_indices = reorder_final
-            is_correct = (orig_indices == self.current_q.correct_indices)
         else:
             orig_indices = [self.displayed_to_original_map[i] for i in selected_display_indices]
-            is_correct = set(orig_indices) == set(self.current_q.correct_indices)
+        is_correct = self.current_q.is_correct(orig_indices)
             
         chosen_text = ", ".join([self.current_q.options[i] for i in orig_indices])
         time_taken = time.time() - self.question_start_time
@@ -1075,7 +1141,8 @@ class GameView(discord.ui.View):
                         self.player.current_q_index + 1, 
                         self.get_rank_str(), 
                         current_sequence=self.reorder_sequence,
-                        powerplay_active=self.session.global_powerplay_active
+                        powerplay_active=self.session.global_powerplay_active,
+                        same_question=True
                     )
                     
                     self.clear_items()
@@ -1084,16 +1151,15 @@ class GameView(discord.ui.View):
                     
                     final_msg = f"🛡️ **Immunity used!**\n{content}".strip()
                     
-                    # [CHANGE] Pass attachments
-                    atts = [file] if file else []
-                    await interaction.response.edit_message(content=final_msg or None, embed=embed, view=self, attachments=atts)
+                    # [CHANGE] Pass attachments (kept as-is for the same question)
+                    await interaction.response.edit_message(content=final_msg or None, embed=embed, view=self, **board_attachments(file))
                     return
             
             # [CRITICAL RESTORE] Stats counting for incorrect answers
             self.player.incorrect_answers += 1
             self.session.question_stats[self.real_q_index] += 1
             if any(p.effect == EffectType.DOUBLE_JEOPARDY for p in self.player.active_powerups):
-                self.player.score = 0
+                self.session.set_score(self.player, 0)
             if not any(p.effect == EffectType.STREAK_SAVER for p in self.player.active_powerups):
                 self.player.streak = 0
         
@@ -1106,13 +1172,14 @@ class GameView(discord.ui.View):
             points = int(base_points * self.current_q.weight)
             if any(p.effect == EffectType.DOUBLE_JEOPARDY for p in self.player.active_powerups):
                 points *= 2
-            self.player.score += points
+            self.session.add_score(self.player, points)
             self.player.streak += 1
             self.player.correct_answers += 1
             self.player.answers_log[-1]['points'] = points
             
             if len(self.player.inventory) < 3 and random.random() < 0.4:
-                pool = [p for p in load_powerups() if p.name not in [x.name for x in self.player.inventory]]
+                owned = {x.name for x in self.player.inventory}
+                pool = [p for p in get_powerup_registry().powerups if p.name not in owned]
                 if pool:
                     new_pup = random.choice(pool)
                     self.player.inventory.append(new_pup)
@@ -1126,7 +1193,7 @@ class GameView(discord.ui.View):
                         gift_amount = abs(int(p.value)) 
                         if gift_amount == 0: gift_amount = 500 # Fallback if value missing
                         
-                        rec.score += gift_amount
+                        self.session.add_score(rec, gift_amount)
                         rec.notifications.append(f"🎁 **{self.player.name} gifted you {gift_amount} pts!**")
                         gift_feedback = f"Gifted {gift_amount}pts to {rec.name}!"
                         
@@ -1149,6 +1216,7 @@ class GameView(discord.ui.View):
 
         self.player.current_q_index += 1
         self.player.current_q_timestamp = 0 
+        schedule_question_timeout(self.session, self.player)
         
         await self.show_intermission(interaction, is_correct, points, new_pup, is_timeout, gift_feedback)
 
@@ -1171,12 +1239,8 @@ class GameView(discord.ui.View):
         if gift_msg: desc += f"**Gift:** {gift_msg}\n"
         if (not correct or timeout) and self.current_q.explanation: desc += f"\n**Explanation:**\n{self.current_q.explanation}"
         embed = discord.Embed(title=title, description=desc, color=color)
-        if self.current_q.type == QuestionType.REORDER:
-            ans_str = " -> ".join([self.current_q.options[i] for i in self.current_q.correct_indices])
-            embed.add_field(name="Correct Sequence", value=ans_str)
-        else:
-            ans_str = ", ".join([self.current_q.options[i] for i in self.current_q.correct_indices])
-            embed.add_field(name="Correct Answer", value=ans_str)
+        ans_str = self.current_q.answer_str
+        embed.add_field(name=self.current_q.answer_field_name, value=ans_str)
         view = IntermissionView(self.session, self.player, correct, ans_str, points, powerup, is_last_question=is_last, gift_msg=gift_msg)
         self.stop()
         if interaction:
@@ -1234,18 +1298,21 @@ class StartAnnouncementView(discord.ui.View):
 class Gameplay(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        asset_cache.bind(bot)
         self.state_loaded = False
         self.startup_time = time.time()
+        self.last_state_save = 0.0
+        self.state_save_inflight = False
         self.bot.loop.create_task(self.load_state())
         self.dashboard_update.start()
         self.bump_task.start()
-        self.check_timeouts.start()
+        self.timeout_task = self.bot.loop.create_task(deadlines.run(self.check_timeouts))
     def cog_unload(self):
         if self.state_loaded: 
             self.save_state()
         self.dashboard_update.cancel()
         self.bump_task.cancel()
-        self.check_timeouts.cancel()
+        self.timeout_task.cancel()
     
     async def _start_game_routine(self, interaction: discord.Interaction, quiz: Quiz):
         # Check if session exists
@@ -1273,19 +1340,55 @@ class Gameplay(commands.Cog):
         # Post Dashboard & Connector
         dash_embed = discord.Embed(title="📊 Live Leaderboard", description="Starting...", color=0xFFD700)
         session.dashboard_msg = await interaction.channel.send(embed=dash_embed, view=LiveDashboardView(session))
+        session.dashboard_next = 0
         session.connector_msg = await interaction.channel.send("🚀 **Game is Live!**", view=StartConnector(session))
     
-    def save_state(self):
-        if not self.state_loaded: return
-        data = {}
-        for cid, session in active_sessions.items():
-            data[str(cid)] = session.to_dict()
+    def _snapshot_state(self):
+        # Serialized to text right here on the loop: to_dict() shares the live
+        # answers_log / view_state / etc, so the pool thread must never walk them
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(data, f, indent=4)
+            return json.dumps({str(cid): session.to_dict() for cid, session in active_sessions.items()}, indent=4)
+        except Exception as e:
+            print(f"Failed to snapshot state: {e}")
+            return None
+
+    @staticmethod
+    def _write_state(text):
+        if text is None: return
+        try:
+            with _state_write_lock:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(STATE_FILE), prefix=".", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        f.write(text)
+                    os.replace(tmp_path, STATE_FILE)
+                except BaseException:
+                    try: os.remove(tmp_path)
+                    except OSError: pass
+                    raise
         except Exception as e:
             print(f"Failed to save state: {e}")
 
+    def save_state(self):
+        # Blocking save, used on unload
+        if not self.state_loaded: return
+        self._write_state(self._snapshot_state())
+
+    async def save_state_async(self):
+        # Snapshot on the loop (sessions mutate there), write on the I/O pool.
+        # Skipped while the previous write is still running; the next tick catches up.
+        if not self.state_loaded or self.state_save_inflight: return
+        self.state_save_inflight = True
+        try:
+            await aio.run_io(self._write_state, self._snapshot_state())
+        finally:
+            self.state_save_inflight = False
+
+    @staticmethod
+    def _read_state():
+        with open(STATE_FILE, 'r') as f:
+            return json.load(f)
+
     async def load_state(self):
         await self.bot.wait_until_ready()
         if not os.path.exists(STATE_FILE): 
@@ -1293,15 +1396,15 @@ class Gameplay(commands.Cog):
             return
         
         try:
-            with open(STATE_FILE, 'r') as f:
-                data = json.load(f)
+            data = await aio.run_io(self._read_state)
             
             for cid_str, s_data in data.items():
                 try:
                     # 1. Reconstruct Quiz
                     quiz_name = s_data['quiz_name']
-                    quiz = load_quiz(quiz_name)
+                    quiz = await aio.load_quiz(quiz_name)
                     if not quiz: continue
+                    asyncio.create_task(asset_cache.warm_quiz(quiz))
                     
                     # 2. Reconstruct Session
                     channel_id = int(s_data['channel_id'])
@@ -1322,9 +1425,13 @@ class Gameplay(commands.Cog):
                     session.last_bump_time = s_data.get('last_bump_time', 0)
                     session.message_counter = s_data.get('message_counter', 0)
 
-                    # 3. Reconstruct Players
+                    # 3. Reconstruct Players (and their pending deadlines)
                     for uid_str, p_data in s_data['players'].items():
-                        session.players[int(uid_str)] = Player.from_dict(p_data)
+                        session.add_player(Player.from_dict(p_data))
+                    for player in session.players.values():
+                        schedule_question_timeout(session, player)
+                    if session.global_powerplay_active:
+                        deadlines.schedule(("powerplay", channel_id), session.global_powerplay_end)
 
                     # 4. Recover & Refresh Messages
                     msg_ids = s_data.get('msg_ids', {})
@@ -1361,23 +1468,13 @@ class Gameplay(commands.Cog):
         self.state_loaded = True
 
     async def session_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[int]]:
-        sessions = get_session_lookup(limit=25)
-        choices = []
-        for s in sessions:
-            if current.lower() in s['label'].lower():
-                choices.append(app_commands.Choice(name=s['label'], value=s['id']))
-        return choices[:25]
+        return [app_commands.Choice(name=label, value=sid) for label, sid in await aio.search("sessions", current)]
 
     async def quiz_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        quiz_map = get_quiz_lookup()
-        choices = []
-        for real_name, filename in quiz_map.items():
-            if current.lower() in real_name.lower():
-                choices.append(app_commands.Choice(name=real_name, value=filename))
-        return choices[:25]
+        return [app_commands.Choice(name=real_name, value=filename) for real_name, filename in await aio.search("quizzes", current)]
     
     async def duration_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        total = get_total_session_count()
+        total = await aio.get_cached("session_count")
         choices = []
         limit = min(total, 10)
         for i in range(1, limit + 1):
@@ -1387,12 +1484,7 @@ class Gameplay(commands.Cog):
         return choices
         
     async def powerup_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        all_pups = load_powerups()
-        choices = []
-        for p in all_pups:
-            if current.lower() in p.name.lower():
-                choices.append(app_commands.Choice(name=p.name, value=p.name))
-        return choices[:25]
+        return [app_commands.Choice(name=name, value=value) for name, value in await aio.search("powerups", current)]
 
     @app_commands.command(name="share", description="Share your result from the last completed quiz")
     async def share_cmd(self, interaction: discord.Interaction):
@@ -1406,9 +1498,7 @@ class Gameplay(commands.Cog):
                 # Only count if they actually finished the quiz
                 if p.completed and p.completion_timestamp > latest_active_time:
                     # Calculate Live Rank
-                    sorted_players = sorted(session.players.values(), key=lambda x: x.score, reverse=True)
-                    try: rank = sorted_players.index(p) + 1
-                    except: rank = 0
+                    rank = session.rank_of(p)
                     
                     # Calculate Stats
                     total_q = len(session.quiz.questions)
@@ -1424,7 +1514,7 @@ class Gameplay(commands.Cog):
         
         # 2. If no active game found, check Database History
         if not stats:
-            stats = get_user_last_quiz_stats(interaction.user.id)
+            stats = await aio.get_user_last_quiz_stats(interaction.user.id)
             
         if not stats:
             await interaction.response.send_message("No completed quiz history found.", ephemeral=True)
@@ -1443,12 +1533,15 @@ class Gameplay(commands.Cog):
 
         # Generate Image
         try:
-            image = create_share_card(stats, interaction.user.display_name, avatar_bytes)
-            
-            # Save to buffer
-            with io.BytesIO() as image_binary:
+            def render():
+                image = create_share_card(stats, interaction.user.display_name, avatar_bytes)
+                image_binary = io.BytesIO()
                 image.save(image_binary, 'PNG')
                 image_binary.seek(0)
+                return image_binary
+            
+            # Render + encode off the event loop
+            with await aio.run_io(render) as image_binary:
                 await interaction.followup.send(file=discord.File(fp=image_binary, filename="result.png"))
         except Exception as e:
             await interaction.followup.send(f"Failed to generate image: {e}")
@@ -1459,7 +1552,7 @@ class Gameplay(commands.Cog):
         if not is_privileged(interaction):
             await interaction.response.send_message("⛔ Admin Only.", ephemeral=True)
             return
-        s_data, players, q_data = get_session_details(session_id)
+        s_data, players, q_data = await aio.get_session_details(session_id)
         if not s_data:
             await interaction.response.send_message("Session not found.", ephemeral=True)
             return
@@ -1493,14 +1586,10 @@ class Gameplay(commands.Cog):
                     hardest_idx = int(idx)
         hardest_str = "N/A"
         if hardest_q:
-            quiz_obj = load_quiz(s_data['quiz_name'])
+            quiz_obj = await aio.load_quiz(s_data['quiz_name'])
             correct_ans_txt = "Unknown"
             if quiz_obj and hardest_idx < len(quiz_obj.questions):
-                q_obj = quiz_obj.questions[hardest_idx]
-                if q_obj.type == QuestionType.REORDER:
-                    correct_ans_txt = " -> ".join([q_obj.options[i] for i in q_obj.correct_indices])
-                else:
-                    correct_ans_txt = ", ".join([q_obj.options[i] for i in q_obj.correct_indices])
+                correct_ans_txt = quiz_obj.questions[hardest_idx].answer_str
             avg_time_q = hardest_q['total_time'] / hardest_q['count']
             hardest_str = (
                 f"__Hardest Question__ {emoji}\n"
@@ -1528,7 +1617,7 @@ class Gameplay(commands.Cog):
             f"**Background Winners (>=25% Acc):**\n```\n{bg_ids_str}\n```\n"
             f"**Trophy Winners (Top 3 Score):**\n```\n{tr_ids_str}\n```"
         )
-        if check_results_sent(session_id):
+        if await aio.check_results_sent(session_id):
             await interaction.response.send_message(id_msg, view=ResultsResendView(final_msg, channel), ephemeral=True)
         else:
             view = ResultsConfirmation(final_msg, channel, bg_ids, trophy_ids, session_id)
@@ -1546,10 +1635,12 @@ class Gameplay(commands.Cog):
             await interaction.response.send_message("⛔ Admin Only.", ephemeral=True)
             return
         
-        quiz = load_quiz(quiz_name)
+        quiz = await aio.load_quiz(quiz_name)
         if not quiz:
             await interaction.response.send_message("Quiz not found.", ephemeral=True)
             return
+        # Get question images onto the CDN before the first board renders
+        asyncio.create_task(asset_cache.warm_quiz(quiz))
 
         # If no announcement channel is specified, just start immediately
         if not announce_channel:
@@ -1617,7 +1708,9 @@ class Gameplay(commands.Cog):
         app_commands.Choice(name="Give Powerup", value="give_pup"),
         app_commands.Choice(name="Simulate Incoming Effect", value="sim_effect"),
         app_commands.Choice(name="Random Answer (Self)", value="rand_ans"),
-        app_commands.Choice(name="Ping / Uptime", value="ping")
+        app_commands.Choice(name="Ping / Uptime", value="ping"),
+        app_commands.Choice(name="Cache / DB Stats", value="cache_stats"),
+        app_commands.Choice(name="DB Query Plans", value="query_plans")
     ])
     @app_commands.autocomplete(powerup_name=powerup_autocomplete)
     async def debug(self, interaction: discord.Interaction, action: str, powerup_name: str = None):
@@ -1660,6 +1753,58 @@ class Gameplay(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
+        # --- 1b. CACHE STATS ---
+        if action == "cache_stats":
+            qc = get_quiz_cache_stats()
+            lookups = qc['hits'] + qc['misses']
+            hit_rate = (qc['hits'] / lookups * 100) if lookups > 0 else 0.0
+            embed = discord.Embed(title="🗃️ Cache Stats", color=0x3498DB)
+            embed.add_field(
+                name="Parsed Quiz Cache",
+                value=(f"Hits: `{qc['hits']}` | Misses: `{qc['misses']}` ({hit_rate:.1f}% hit)\n"
+                       f"Size: `{qc['size']}/{qc['capacity']}` | Evictions: `{qc['evictions']}`"),
+                inline=False
+            )
+            ws = get_writer_stats()
+            embed.add_field(
+                name="History DB Writer",
+                value=(f"Queue: `{ws['queue_depth']}` | Running: `{ws['alive']}`\n"
+                       f"Jobs: `{ws['jobs']}` in `{ws['batches']}` commits (max batch `{ws['max_batch']}`) | Failed: `{ws['failed']}`\n"
+                       f"Commit: last `{ws['last_commit_ms']:.1f}ms` | avg `{ws['avg_commit_ms']:.1f}ms`"),
+                inline=False
+            )
+            ts = timeout_stats
+            ss = board_edits.get_stats()
+            embed.add_field(
+                name="Question Timeouts",
+                value=(f"Scheduled: `{len(deadlines)}` | Wake-ups: `{ts['ticks']}` (last `{ts['last_tick_ms']:.1f}ms`)\n"
+                       f"Expired: last `{ts['last_expired']}` | max `{ts['max_expired']}` | total `{ts['total_expired']}`"),
+                inline=False
+            )
+            embed.add_field(
+                name="Board Edit Queue",
+                value=(f"Submitted: `{ss['submitted']}` | Coalesced: `{ss['coalesced']}` | Dropped: `{ss['dropped']}` | Sent: `{ss['sent']}` | Failed: `{ss['failed']}` | 429 retries: `{ss['retried']}`\n"
+                       f"Pending: `{ss['pending']}` (max `{ss['max_pending']}`)\n"
+                       f"Latency: last `{ss['last_latency_ms']:.0f}ms` | avg `{ss['avg_latency_ms']:.0f}ms` | max `{ss['max_latency_ms']:.0f}ms`"),
+                inline=False
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        # --- 1c. QUERY PLANS (are the history indexes being used?) ---
+        if action == "query_plans":
+            report = await aio.run_io(check_query_plans)
+            bad = [r for r in report if not r['ok']]
+            desc = ""
+            for r in report:
+                icon = "✅" if r['ok'] else "⚠️"
+                plan = r['plan'][0] if r['plan'] else "?"
+                desc += f"{icon} **{r['name']}**: `{plan[:80]}`\n"
+            embed = discord.Embed(title="🔎 DB Query Plans", description=desc[:4000], color=0xE67E22 if bad else 0x2ECC71)
+            embed.set_footer(text=f"{len(report) - len(bad)}/{len(report)} queries use an index")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
         # --- 2. VALIDATE SESSION (Required for other actions) ---
         session = active_sessions.get(interaction.channel_id)
         if not session:
@@ -1673,8 +1818,7 @@ class Gameplay(commands.Cog):
 
         # --- 3. GAME ACTIONS ---
         if action == "give_pup":
-            all_pups = load_powerups()
-            target = next((p for p in all_pups if p.name == powerup_name), None)
+            target = get_powerup(powerup_name)
             if target:
                 player.inventory.append(target)
                 await interaction.response.send_message(f"✅ Added {target.name}", ephemeral=True)
@@ -1682,34 +1826,32 @@ class Gameplay(commands.Cog):
                 await interaction.response.send_message("Powerup not found.", ephemeral=True)
 
         elif action == "sim_effect":
-            all_pups = load_powerups()
-            target_pup = next((p for p in all_pups if p.name == powerup_name), None)
+            target_pup = get_powerup(powerup_name)
             if not target_pup:
                 await interaction.response.send_message("Powerup not found.", ephemeral=True)
                 return
 
             if target_pup.effect == EffectType.GIFT:
-                player.score += int(target_pup.value)
+                session.add_score(player, int(target_pup.value))
                 player.notifications.append(f"🎁 **Debug Gift: {int(target_pup.value)} pts!**")
                 await interaction.response.send_message(f"✅ Simulated incoming {target_pup.name} (+{int(target_pup.value)} pts)", ephemeral=True)
                 # Force update to show score change
-                await push_update_to_player(session, player)
+                push_update_to_player(session, player, priority=True)
 
             elif target_pup.effect == EffectType.GLITCH:
                 await interaction.response.send_message(f"✅ Simulated incoming {target_pup.name}", ephemeral=True)
                 # Trigger glitch visual
-                asyncio.create_task(push_update_to_player(session, player, glitch=True))
+                push_update_to_player(session, player, glitch=True, priority=True)
                 # Revert task
                 async def revert():
                     await asyncio.sleep(10)
-                    asyncio.create_task(push_update_to_player(session, player, glitch=False))
+                    push_update_to_player(session, player, glitch=False, priority=True)
                 self.bot.loop.create_task(revert())
 
             elif target_pup.effect == EffectType.POWER_PLAY:
-                session.global_powerplay_end = time.time() + 20
-                session.global_powerplay_active = True
+                start_powerplay(session)
                 for p in session.players.values():
-                    asyncio.create_task(push_update_to_player(session, p))
+                    push_update_to_player(session, p)
                 await interaction.response.send_message(f"✅ Simulated Global {target_pup.name}", ephemeral=True)
             
             else:
@@ -1732,11 +1874,15 @@ class Gameplay(commands.Cog):
     @app_commands.command(name="leaderboard", description="View aggregate leaderboards")
     @app_commands.autocomplete(duration=duration_autocomplete)
     async def leaderboard(self, interaction: discord.Interaction, duration: str):
-        session_ids = get_session_ids_by_limit(duration)
-        if not session_ids:
-            await interaction.response.send_message("No data.", ephemeral=False)
-            return
-        data = get_leaderboard_data(session_ids)
+        if duration == "All-Time":
+            # Served from the user_totals aggregate, no per-session scan
+            data = await aio.get_all_time_leaderboard()
+        else:
+            since_id = await aio.get_session_bound(duration)
+            if since_id is None:
+                await interaction.response.send_message("No data.", ephemeral=False)
+                return
+            data = await aio.get_leaderboard_data(since_id)
         if not data:
             await interaction.response.send_message("No data.", ephemeral=False)
             return
@@ -1747,11 +1893,11 @@ class Gameplay(commands.Cog):
     @app_commands.command(name="roundup", description="View aggregate statistics")
     @app_commands.autocomplete(duration=duration_autocomplete)
     async def roundup(self, interaction: discord.Interaction, duration: str):
-        session_ids = get_session_ids_by_limit(duration)
-        if not session_ids:
+        since_id = await aio.get_session_bound(duration)
+        if since_id is None:
             await interaction.response.send_message("No data.", ephemeral=True)
             return
-        data = get_roundup_data(session_ids)
+        data = await aio.get_roundup_data(since_id)
         embed = discord.Embed(title=f"📊 Roundup ({duration})", color=0x9B59B6)
         embed.add_field(name="Unique Players", value=str(data['unique_users']), inline=True)
         embed.add_field(name="Total Answers", value=str(data['total_questions_answered']), inline=True)
@@ -1800,53 +1946,70 @@ class Gameplay(commands.Cog):
             session.message_counter = 0
             await interaction.response.send_message(f"✅ Auto-bump set to every {value} messages.", ephemeral=True)
 
-    @tasks.loop(seconds=1)
-    async def check_timeouts(self):
+    async def check_timeouts(self, due):
+        # Called by the deadline scheduler with only the keys that expired.
+        # Entries can be stale (player left, answered, game ended), so re-check.
+        # State changes happen here synchronously; the board edits go to board_edits.
+        t0 = time.perf_counter()
         now = time.time()
-        
-        # [CHANGE] Auto-expire Power Play
-        for session in active_sessions.values():
-            if session.global_powerplay_active and now > session.global_powerplay_end:
-                session.global_powerplay_active = False
+        expired = 0
+        for key in due:
+            session = active_sessions.get(key[1])
+            if not session: continue
+
+            # [CHANGE] Auto-expire Power Play
+            if key[0] == "powerplay":
+                if session.global_powerplay_active:
+                    if now >= session.global_powerplay_end: session.global_powerplay_active = False
+                    else: deadlines.schedule(key, session.global_powerplay_end)
+                continue
 
-        for session in active_sessions.values():
             if not session.is_running: continue
-            for player in session.players.values():
-                if player.completed or player.current_q_timestamp == 0: continue
-                is_frozen = any(p.effect == EffectType.TIME_FREEZE for p in player.active_powerups)
-                if is_frozen: continue
-                q_idx = player.question_order[player.current_q_index]
-                q = session.quiz.questions[q_idx]
-                if now > (player.current_q_timestamp + q.time_limit + 1):
-                    player.incorrect_answers += 1
-                    session.question_stats[q_idx] += 1
-                    if any(p.effect == EffectType.DOUBLE_JEOPARDY for p in player.active_powerups): player.score = 0
-                    if not any(p.effect == EffectType.STREAK_SAVER for p in player.active_powerups): player.streak = 0
-                    
-                    player.answers_log.append({
-                        "q_index": q_idx, "q_text": q.text, "chosen": [], "chosen_text": "TIMEOUT", "is_correct": False, "time": q.time_limit, "points": 0
-                    })
-                    
-                    # [CHANGE] Keep Immunity on Timeout
-                    player.active_powerups = [p for p in player.active_powerups if p.effect == EffectType.IMMUNITY]
-                    
-                    player.current_q_index += 1
-                    player.current_q_timestamp = 0 
-                    if player.board_message:
-                        try:
-                            is_last = player.current_q_index >= len(player.question_order)
-                            color = 0xFF0000
-                            embed = discord.Embed(title="⏰ Time's Up!", description=f"**Points:** +0\n**Streak:** {player.streak} 🔥\n", color=color)
-                            if q.explanation: embed.description += f"\n**Explanation:**\n{q.explanation}"
-                            if q.type == QuestionType.REORDER:
-                                ans_str = " -> ".join([q.options[i] for i in q.correct_indices])
-                                embed.add_field(name="Correct Sequence", value=ans_str)
-                            else:
-                                ans_str = ", ".join([q.options[i] for i in q.correct_indices])
-                                embed.add_field(name="Correct Answer", value=ans_str)
-                            view = IntermissionView(session, player, False, ans_str, 0, None, is_last_question=is_last)
-                            await player.board_message.edit(content=None, embed=embed, view=view, attachments=[])
-                        except: pass
+            player = session.players.get(key[2])
+            if not player: continue
+            if player.completed or player.current_q_timestamp == 0: continue
+            is_frozen = any(p.effect == EffectType.TIME_FREEZE for p in player.active_powerups)
+            if is_frozen: continue
+            q_idx = player.question_order[player.current_q_index]
+            q = session.quiz.questions[q_idx]
+            if now < (player.current_q_timestamp + q.time_limit + 1):
+                schedule_question_timeout(session, player)
+                continue
+            player.incorrect_answers += 1
+            session.question_stats[q_idx] += 1
+            if any(p.effect == EffectType.DOUBLE_JEOPARDY for p in player.active_powerups): session.set_score(player, 0)
+            if not any(p.effect == EffectType.STREAK_SAVER for p in player.active_powerups): player.streak = 0
+            
+            player.answers_log.append({
+                "q_index": q_idx, "q_text": q.text, "chosen": [], "chosen_text": "TIMEOUT", "is_correct": False, "time": q.time_limit, "points": 0
+            })
+            
+            # [CHANGE] Keep Immunity on Timeout
+            player.active_powerups = [p for p in player.active_powerups if p.effect == EffectType.IMMUNITY]
+            
+            player.current_q_index += 1
+            player.current_q_timestamp = 0 
+            expired += 1
+            if player.board_message:
+                try:
+                    is_last = player.current_q_index >= len(player.question_order)
+                    color = 0xFF0000
+                    embed = discord.Embed(title="⏰ Time's Up!", description=f"**Points:** +0\n**Streak:** {player.streak} 🔥\n", color=color)
+                    if q.explanation: embed.description += f"\n**Explanation:**\n{q.explanation}"
+                    ans_str = q.answer_str
+                    embed.add_field(name=q.answer_field_name, value=ans_str)
+                    view = IntermissionView(session, player, False, ans_str, 0, None, is_last_question=is_last)
+                    msg = player.board_message
+                    # Final: replaces any broadcast still queued for this board, and later
+                    # pushes can't replace it (they'd find the board between questions and skip)
+                    board_edits.submit(board_key(session, player), lambda msg=msg, embed=embed, view=view: msg.edit(content=None, embed=embed, view=view, attachments=[]), final=True)
+                except: pass
+
+        timeout_stats["ticks"] += 1
+        timeout_stats["last_expired"] = expired
+        timeout_stats["max_expired"] = max(timeout_stats["max_expired"], expired)
+        timeout_stats["total_expired"] += expired
+        timeout_stats["last_tick_ms"] = (time.perf_counter() - t0) * 1000
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -1864,31 +2027,58 @@ class Gameplay(commands.Cog):
             await interaction.response.send_message("⛔ Admin Only.", ephemeral=True)
             return
         view = HistoryPaginationView()
+        await view.update_components()
         await interaction.response.send_message(content="Select a session:", view=view, ephemeral=True)
 
-    @tasks.loop(seconds=5)
+    @staticmethod
+    def dashboard_rows(session: GameSession):
+        rows = []
+        for p in session.top_players(10):
+            progress = f"{p.current_q_index + 1}/{len(p.question_order)}"
+            status = "✅ Done" if p.completed else f"Q{progress}"
+            rows.append((p.name, p.score, p.streak, status))
+        return tuple(rows)
+
+    @tasks.loop(seconds=DASHBOARD_TICK)
     async def dashboard_update(self):
+        # Each session is checked on its own adaptive interval: back to
+        # DASHBOARD_MIN_INTERVAL when something changed, stretched toward
+        # DASHBOARD_MAX_INTERVAL while idle. Edits only happen when the
+        # rendered rows differ from what's on screen, so idle games cost no API calls.
         if not self.state_loaded: return
-        self.save_state() # CHANGED: Auto-save every loop
-        for session in active_sessions.values():
+        now = time.time()
+        if now - self.last_state_save >= STATE_SAVE_INTERVAL:
+            self.last_state_save = now
+            await self.save_state_async() # CHANGED: Auto-save every loop
+        for session in list(active_sessions.values()):
+            if now < session.dashboard_next: continue
+            changed = False
             if session.is_running and hasattr(session, 'dashboard_msg') and session.dashboard_msg:
-                sorted_players = sorted(session.players.values(), key=lambda p: p.score, reverse=True)
-                desc = ""
-                for i, p in enumerate(sorted_players[:10]): 
-                    progress = f"{p.current_q_index + 1}/{len(p.question_order)}"
-                    status = "✅ Done" if p.completed else f"Q{progress}"
-                    desc += f"**{i+1}. {p.name}** - {p.score} pts (Streak: {p.streak} 🔥) [{status}]\n"
-                embed = discord.Embed(title="📊 Live Leaderboard", description=desc, color=0xFFD700)
-                try: await session.dashboard_msg.edit(embed=embed)
-                except: pass
+                rows = self.dashboard_rows(session)
+                sig = (session.dashboard_msg.id, rows)
+                if sig != session.dashboard_sig:
+                    changed = True
+                    desc = ""
+                    for i, (name, score, streak, status) in enumerate(rows):
+                        desc += f"**{i+1}. {name}** - {score} pts (Streak: {streak} 🔥) [{status}]\n"
+                    embed = discord.Embed(title="📊 Live Leaderboard", description=desc, color=0xFFD700)
+                    try:
+                        await session.dashboard_msg.edit(embed=embed)
+                        session.dashboard_sig = sig
+                    except: pass
             
-            # [NEW] Update Admin Lobby Embed if active
+            # [NEW] Update Admin Lobby Embed if active (only when the player list changed)
             if hasattr(session, 'admin_lobby_msg') and session.admin_lobby_msg:
                 try:
                     view = getattr(session, 'admin_lobby_view', None)
-                    if view:
+                    if view and view.signature() != view.rendered_sig:
+                        changed = True
                         await session.admin_lobby_msg.edit(embed=view.get_embed())
                 except: pass
+
+            if changed: session.dashboard_interval = DASHBOARD_MIN_INTERVAL
+            else: session.dashboard_interval = min(DASHBOARD_MAX_INTERVAL, max(DASHBOARD_MIN_INTERVAL, session.dashboard_interval * 1.5))
+            session.dashboard_next = now + session.dashboard_interval
                 
     @tasks.loop(seconds=10)
     async def bump_task(self):
@@ -1935,10 +2125,10 @@ class Gameplay(commands.Cog):
         async def action(intr):
             if user.id in session.players:
                 # Log Data
-                log_moderation_action(user.id, player.name, interaction.user.id, "REMOVE", reason, session.quiz.name)
+                await aio.log_moderation_action(user.id, player.name, interaction.user.id, "REMOVE", reason, session.quiz.name)
                 
                 # Remove from session
-                del session.players[user.id]
+                session.remove_player(user.id)
                 
                 # DM User
                 try:
@@ -1964,16 +2154,16 @@ class Gameplay(commands.Cog):
 
         async def action(intr):
             # 1. DB Ban
-            ban_user_db(user.id, interaction.user.id, reason)
+            await aio.ban_user_db(user.id, interaction.user.id, reason)
             
             # 2. Log Action
-            log_moderation_action(user.id, user.display_name, interaction.user.id, "BAN", reason, "GLOBAL")
+            await aio.log_moderation_action(user.id, user.display_name, interaction.user.id, "BAN", reason, "GLOBAL")
             
             # 3. Remove from ANY active session
             removed_count = 0
             for session in active_sessions.values():
                 if user.id in session.players:
-                    del session.players[user.id]
+                    session.remove_player(user.id)
                     removed_count += 1
             
             # 4. DM User
@@ -2007,10 +2197,10 @@ class Gameplay(commands.Cog):
              return
 
         # Perform Unban
-        unban_user_db(uid)
+        await aio.unban_user_db(uid)
         
         # Log it
-        log_moderation_action(uid, f"ID:{uid}", interaction.user.id, "UNBAN", reason, "GLOBAL")
+        await aio.log_moderation_action(uid, f"ID:{uid}", interaction.user.id, "UNBAN", reason, "GLOBAL")
         
         await interaction.response.send_message(f"✅ **Unbanned User ID:** `{uid}`", ephemeral=True)
         
@@ -2021,7 +2211,7 @@ class Gameplay(commands.Cog):
             await interaction.response.send_message("⛔ Hardcoded Admin Only.", ephemeral=True)
             return
         
-        logs = get_moderation_history(limit=15)
+        logs = await aio.get_moderation_history(limit=15)
         if not logs:
             await interaction.response.send_message("No logs found.", ephemeral=True)
             return
@@ -2037,40 +2227,45 @@ class Gameplay(commands.Cog):
             
         await interaction.response.send_message(embed=embed, ephemeral=True)
         
-    @app_commands.command(name="fix_score", description="Admin: Overwrite points for a specific question (e.g. if broken)")
+    @app_commands.command(name="fix_score", description="Admin: Overwrite points for specific question(s) (e.g. if broken)")
     @app_commands.describe(
         session_id="The ID of the session to fix",
-        question_num="The Question Number (e.g. 5 for Q5)",
-        points="The points EVERYONE should get for this question"
+        question_num="The Question Number (e.g. 5 for Q5, or 3,5 for several)",
+        points="The points EVERYONE should get for these questions"
     )
-    async def fix_score(self, interaction: discord.Interaction, session_id: int, question_num: int, points: int):
+    async def fix_score(self, interaction: discord.Interaction, session_id: int, question_num: str, points: int):
         if not is_privileged(interaction):
             await interaction.response.send_message("⛔ Hardcoded Admin Only.", ephemeral=True)
             return
             
         # Convert Q5 (user view) to Index 4 (db view)
-        q_idx = question_num - 1 
+        try:
+            q_nums = sorted({int(part) for part in question_num.replace(" ", ",").split(",") if part.strip()})
+        except ValueError:
+            q_nums = []
         
-        if q_idx < 0:
+        if not q_nums or q_nums[0] < 1:
             await interaction.response.send_message("❌ Invalid Question Number.", ephemeral=True)
             return
+        q_indices = [n - 1 for n in q_nums]
+        q_label = ", ".join(f"Q{n}" for n in q_nums)
 
         await interaction.response.defer(ephemeral=True)
         
-        # Run Update
-        count = adjust_session_question(session_id, q_idx, points, count_as_correct=True)
+        # Run Update (all questions in one write job)
+        count = await aio.adjust_session_question(session_id, q_indices, points, count_as_correct=True)
         
         if count > 0:
             # Log it
-            log_moderation_action(0, "SYSTEM", interaction.user.id, "FIX_SCORE", f"Set Q{question_num} to {points}pts", f"Session {session_id}")
+            await aio.log_moderation_action(0, "SYSTEM", interaction.user.id, "FIX_SCORE", f"Set {q_label} to {points}pts", f"Session {session_id}")
             
             await interaction.followup.send(
                 f"✅ **Success!**\n"
-                f"Updated **{count}** player records for Session `{session_id}` Question **{question_num}**.\n"
-                f"Everyone who encountered this question now has **{points} points** and it is marked **Correct**."
+                f"Updated **{count}** answer records for Session `{session_id}` **{q_label}**.\n"
+                f"Everyone who encountered {'these questions' if len(q_nums) > 1 else 'this question'} now has **{points} points** and it is marked **Correct**."
             )
         else:
-            await interaction.followup.send(f"⚠️ No records found for Session `{session_id}` Question `{question_num}`.")
+            await interaction.followup.send(f"⚠️ No records found for Session `{session_id}` {q_label}.")
 
 async def setup(bot):
     await bot.add_cog(Gameplay(bot))
\ No newline at end of file
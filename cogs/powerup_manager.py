@@ -2,7 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.classes import CustomPowerUp, EffectType
-from utils.data_manager import load_powerups, save_all_powerups
+from utils import autocomplete, aio
 
 ADMIN_IDS = [368792134645448704, 193855542366568448]
 
@@ -108,9 +108,10 @@ class PowerUpModal(discord.ui.Modal, title="Create Custom Power-up"):
             icon=self.icon.value
         )
         
-        current_list = load_powerups()
+        current_list = await aio.load_powerups()
         current_list.append(new_p)
-        save_all_powerups(current_list)
+        await aio.save_all_powerups(current_list)
+        autocomplete.invalidate("powerups")
         
         await interaction.response.send_message(f"✅ Created Power-up: **{new_p.name}** ({self.effect_type})", ephemeral=True)
 
@@ -139,7 +140,7 @@ class PowerUpManager(commands.Cog):
             await interaction.response.send_message("⛔ Admin only.", ephemeral=True)
             return
             
-        powerups = load_powerups()
+        powerups = await aio.load_powerups()
         if not powerups:
             await interaction.response.send_message("No powerups found.", ephemeral=True)
             return
@@ -156,14 +157,15 @@ class PowerUpManager(commands.Cog):
             await interaction.response.send_message("⛔ Admin only.", ephemeral=True)
             return
             
-        powerups = load_powerups()
+        powerups = await aio.load_powerups()
         # Filter out the one to delete
         new_list = [p for p in powerups if p.name.lower() != name.lower()]
         
         if len(new_list) == len(powerups):
             await interaction.response.send_message(f"❌ Could not find powerup named '{name}'", ephemeral=True)
         else:
-            save_all_powerups(new_list)
+            await aio.save_all_powerups(new_list)
+            autocomplete.invalidate("powerups")
             await interaction.response.send_message(f"🗑️ Deleted **{name}**.", ephemeral=True)
 
 async def setup(bot):
@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 
 # 1. Load environment variables
 load_dotenv()
+
+from utils import autocomplete, aio, db_manager, quiz_store
 TOKEN = os.getenv('DISCORD_TOKEN')
 
 if not TOKEN:
@@ -21,22 +23,7 @@ ADMIN_IDS = [368792134645448704, 193855542366568448]
 # --- AUTOCOMPLETE & RELOAD COMMAND ---
 
 async def reload_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-    choices = []
-    # Scan cogs
-    if os.path.exists('./cogs'):
-        for filename in os.listdir('./cogs'):
-            if filename.endswith('.py'):
-                name = f"cogs.{filename[:-3]}"
-                if current.lower() in name.lower():
-                    choices.append(app_commands.Choice(name=name, value=name))
-    # Scan utils
-    if os.path.exists('./utils'):
-        for filename in os.listdir('./utils'):
-            if filename.endswith('.py'):
-                name = f"utils.{filename[:-3]}"
-                if current.lower() in name.lower():
-                    choices.append(app_commands.Choice(name=name, value=name))
-    return choices[:25]
+    return [app_commands.Choice(name=name, value=value) for name, value in autocomplete.search("modules", current)]
 
 @app_commands.command(name="reload", description="Reload any file (Cogs or Utils)")
 @app_commands.describe(extension="Select the file to reload")
@@ -94,6 +81,8 @@ class QuizBot(commands.Bot):
         self.extension_times = {}
 
     async def setup_hook(self):
+        # Long-lived history DB connections for the bot's lifetime
+        db_manager.open_db()
         if os.path.exists('./cogs'):
             for filename in os.listdir('./cogs'):
                 if filename.endswith('.py'):
@@ -110,6 +99,13 @@ class QuizBot(commands.Bot):
         await self.tree.sync()
         print("Slash commands synced.")
 
+    async def close(self):
+        await super().close()
+        # Cogs are unloaded by now; drain queued I/O, then release the DB handles
+        aio.shutdown()
+        db_manager.close_db()
+        quiz_store.close()
+
     async def on_ready(self):
         print(f'Logged in as {self.user} (ID: {self.user.id})')
         print('------')
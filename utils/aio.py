@@ -0,0 +1,75 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from . import data_manager, db_manager, autocomplete
+
+# Awaitable counterparts of the blocking data_manager / db_manager functions.
+# Each call runs on a dedicated, bounded thread pool so slow disk or sqlite I/O
+# never stalls the event loop. Cogs use these (`await aio.load_quiz(...)`);
+# the blocking originals stay available for scripts.
+#
+# Targets are looked up by name at call time, so `/reload utils.db_manager`
+# is picked up without reloading this module.
+
+IO_WORKERS = 4
+_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="quiz-io")
+
+async def run_io(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+def _awaitable(module, name):
+    async def wrapper(*args, **kwargs):
+        return await run_io(getattr(module, name), *args, **kwargs)
+    wrapper.__name__ = name
+    wrapper.__qualname__ = name
+    wrapper.__doc__ = f"Awaitable {module.__name__}.{name}, run on the I/O executor."
+    return wrapper
+
+def _write_awaitable(module, name):
+    # db_manager write jobs already run on the writer thread; just await its Future
+    async def wrapper(*args, **kwargs):
+        return await asyncio.wrap_future(getattr(module, name).submit(*args, **kwargs))
+    wrapper.__name__ = name
+    wrapper.__qualname__ = name
+    wrapper.__doc__ = f"Awaitable {module.__name__}.{name}, queued on the DB writer thread."
+    return wrapper
+
+def shutdown():
+    _executor.shutdown(wait=True)
+
+# --- data_manager ---
+load_quiz = _awaitable(data_manager, "load_quiz")
+save_quiz = _awaitable(data_manager, "save_quiz")
+delete_quiz_file = _awaitable(data_manager, "delete_quiz_file")
+flush_quiz_writes = _awaitable(data_manager, "flush_quiz_writes")
+get_quiz_lookup = _awaitable(data_manager, "get_quiz_lookup")
+load_powerups = _awaitable(data_manager, "load_powerups")
+save_all_powerups = _awaitable(data_manager, "save_all_powerups")
+
+# --- db_manager ---
+save_report_rows = _write_awaitable(db_manager, "save_report_rows")  # rows from db_manager.build_report_rows
+check_results_sent = _awaitable(db_manager, "check_results_sent")
+mark_results_sent = _write_awaitable(db_manager, "mark_results_sent")
+get_total_session_count = _awaitable(db_manager, "get_total_session_count")
+get_session_bound = _awaitable(db_manager, "get_session_bound")
+get_leaderboard_data = _awaitable(db_manager, "get_leaderboard_data")
+get_all_time_leaderboard = _awaitable(db_manager, "get_all_time_leaderboard")
+get_roundup_data = _awaitable(db_manager, "get_roundup_data")
+get_history_page = _awaitable(db_manager, "get_history_page")
+get_session_lookup = _awaitable(db_manager, "get_session_lookup")
+get_session_details = _awaitable(db_manager, "get_session_details")
+delete_session = _write_awaitable(db_manager, "delete_session")
+delete_sessions_range = _write_awaitable(db_manager, "delete_sessions_range")
+log_moderation_action = _write_awaitable(db_manager, "log_moderation_action")
+ban_user_db = _write_awaitable(db_manager, "ban_user_db")
+unban_user_db = _write_awaitable(db_manager, "unban_user_db")
+get_moderation_history = _awaitable(db_manager, "get_moderation_history")
+get_user_last_quiz_stats = _awaitable(db_manager, "get_user_last_quiz_stats")
+adjust_session_question = _write_awaitable(db_manager, "adjust_session_question")
+# check_is_banned is an in-memory set lookup now; call db_manager directly
+
+# --- autocomplete (source refreshes hit disk / sqlite) ---
+search = _awaitable(autocomplete, "search")
+get_cached = _awaitable(autocomplete, "get_cached")
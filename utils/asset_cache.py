@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import discord
+
+from . import aio
+
+# Upload-once cache for local question images.
+# Each image is uploaded a single time to a storage channel (ASSET_CHANNEL_ID) and
+# the CDN URL is remembered by content hash, so board renders only reference the
+# URL instead of re-attaching the file. Discord attachment URLs are signed and
+# expire (~24h), so entries are refreshed after ASSET_TTL.
+# Without ASSET_CHANNEL_ID the bot keeps attaching files as before.
+ASSET_FILE = os.path.join("data", "image_assets.json")
+ASSET_CHANNEL_ID = int(os.getenv("ASSET_CHANNEL_ID", "0") or 0)
+ASSET_TTL = 20 * 3600
+
+_client = None
+_assets = None           # sha256 -> {"url": str, "expires": float}
+_path_hashes = {}        # abs path -> (mtime, size, sha256)
+_uploads = {}            # sha256 -> in-flight upload task
+
+def bind(client):
+    global _client
+    _client = client
+
+def enabled() -> bool:
+    return bool(ASSET_CHANNEL_ID) and _client is not None
+
+# --- PERSISTENCE ---
+
+def _load_assets():
+    global _assets
+    if _assets is None:
+        try:
+            with open(ASSET_FILE, 'r') as f:
+                _assets = json.load(f)
+        except (OSError, ValueError):
+            _assets = {}
+    return _assets
+
+def _write_assets(snapshot):
+    os.makedirs(os.path.dirname(ASSET_FILE), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(ASSET_FILE), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f, indent=4)
+        os.replace(tmp_path, ASSET_FILE)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+# --- HASHING ---
+
+def _hash_file(path):
+    st = os.stat(path)
+    cached = _path_hashes.get(path)
+    if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _path_hashes[path] = (st.st_mtime, st.st_size, digest)
+    return digest
+
+# --- LOOKUP / UPLOAD ---
+
+def get_url(path: str, allow_stale: bool = False):
+    # Render-path lookup: memory only, never touches disk or the network.
+    # allow_stale is for re-renders of a question that is already on screen.
+    cached = _path_hashes.get(path)
+    if not cached: return None
+    entry = _load_assets().get(cached[2])
+    if not entry: return None
+    if not allow_stale and entry["expires"] <= time.time(): return None
+    return entry["url"]
+
+async def _upload(path, digest, filename):
+    channel = _client.get_channel(ASSET_CHANNEL_ID) or await _client.fetch_channel(ASSET_CHANNEL_ID)
+    msg = await channel.send(content=f"asset `{digest[:12]}`", file=discord.File(path, filename=filename))
+    url = msg.attachments[0].url
+    assets = _load_assets()
+    assets[digest] = {"url": url, "expires": time.time() + ASSET_TTL}
+    await aio.run_io(_write_assets, dict(assets))
+    return url
+
+async def ensure(path: str, filename: str = None):
+    # Returns the CDN URL for a local image, uploading it at most once per content hash
+    if not enabled(): return None
+    try:
+        digest = await aio.run_io(_hash_file, path)
+    except OSError:
+        return None
+    url = get_url(path)
+    if url: return url
+    task = _uploads.get(digest)
+    if task is None:
+        task = asyncio.create_task(_upload(path, digest, filename or os.path.basename(path)))
+        _uploads[digest] = task
+        task.add_done_callback(lambda _t: _uploads.pop(digest, None))
+    try:
+        return await asyncio.shield(task)
+    except Exception as e:
+        print(f"Asset upload failed for {path}: {e}")
+        return None
+
+def schedule(path: str, filename: str = None):
+    # Fire-and-forget from sync render code; the next render picks up the URL
+    if not enabled(): return
+    try: asyncio.get_running_loop().create_task(ensure(path, filename))
+    except RuntimeError: pass
+
+async def warm_quiz(quiz):
+    # Upload (or refresh) every local image of a quiz before players need it
+    if not enabled(): return
+    jobs = [ensure(q.image_path, q.image_filename) for q in quiz.questions if getattr(q, "image_kind", None) == "file"]
+    if jobs: await asyncio.gather(*jobs)
@@ -0,0 +1,173 @@
+import bisect
+import heapq
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+
+from .data_manager import get_quiz_lookup, get_powerup_registry
+from .db_manager import get_session_lookup, get_total_session_count
+
+# Shared autocomplete service. Each source is a loader returning (label, value)
+# pairs; its result is memoized for a short TTL and turned into an index with
+# prefix (bisect over sorted labels / words) and n-gram (substring + fuzzy)
+# lookups, so a keystroke never rescans the source list.
+#
+# Ranking: exact > label prefix > word prefix > substring > fuzzy (trigram overlap).
+
+MAX_CHOICES = 25
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+class AutocompleteIndex:
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self._lower = [str(label).lower() for label, _ in self.entries]
+
+        self._exact = defaultdict(list)
+        for i, label in enumerate(self._lower):
+            self._exact[label].append(i)
+
+        self._labels = sorted((label, i) for i, label in enumerate(self._lower))
+        self._label_keys = [label for label, _ in self._labels]
+
+        words = []
+        for i, label in enumerate(self._lower):
+            for pos, word in enumerate(label.split()):
+                if pos > 0: words.append((word, i))
+        words.sort()
+        self._words = words
+        self._word_keys = [word for word, _ in words]
+
+        # 1-grams answer one/two character queries, 3-grams everything longer
+        self._unigrams = defaultdict(set)
+        self._trigrams = defaultdict(set)
+        for i, label in enumerate(self._lower):
+            for ch in set(label): self._unigrams[ch].add(i)
+            for tri in _grams(label, 3): self._trigrams[tri].add(i)
+
+    @staticmethod
+    def _prefix_range(keys, pairs, query):
+        lo = bisect.bisect_left(keys, query)
+        hi = bisect.bisect_left(keys, query + "\uffff")
+        return (pairs[j][1] for j in range(lo, hi))
+
+    def _substring_candidates(self, query):
+        if len(query) < 3:
+            sets = [self._unigrams.get(ch, set()) for ch in set(query)]
+        else:
+            sets = [self._trigrams.get(tri, set()) for tri in _grams(query, 3)]
+        if not sets: return []
+        sets.sort(key=len)
+        candidates = set(sets[0]).intersection(*sets[1:])
+        return sorted(i for i in candidates if query in self._lower[i])
+
+    def _fuzzy_candidates(self, query, limit):
+        postings = sorted((self._trigrams[tri] for tri in _grams(query, 3) if tri in self._trigrams), key=len)
+        if not postings: return []
+        # Very common trigrams cost the most to count and carry little ranking signal
+        cap = max(50, len(self.entries) // 10)
+        postings = [p for p in postings if len(p) <= cap] or postings[:2]
+        hits = Counter(chain.from_iterable(postings))
+        threshold = max(1, len(postings) // 2)
+        best = heapq.nlargest(limit, hits.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [i for i, count in best if count >= threshold]
+
+    def search(self, query: str, limit: int = MAX_CHOICES):
+        query = (query or "").lower().strip()
+        if not query:
+            return self.entries[:limit]
+
+        results = []
+        seen = set()
+        def take(ids):
+            for i in ids:
+                if i in seen: continue
+                seen.add(i)
+                results.append(self.entries[i])
+                if len(results) >= limit: return True
+            return False
+
+        if take(self._exact.get(query, ())): return results
+        if take(self._prefix_range(self._label_keys, self._labels, query)): return results
+        if take(self._prefix_range(self._word_keys, self._words, query)): return results
+        if take(self._substring_candidates(query)): return results
+        take(self._fuzzy_candidates(query, limit))
+        return results
+
+class CachedSource:
+    # get()/index() run on the utils.aio worker threads, so reload and index
+    # build happen under _lock (concurrent callers wait for one build instead of
+    # racing on _value/_index). invalidate() is called from the event loop and
+    # only flags the source stale, so it never waits behind a loader.
+    def __init__(self, loader, ttl: float):
+        self.loader = loader
+        self.ttl = ttl
+        self._value = None
+        self._index = None
+        self._loaded_at = 0.0
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._stale or self._value is None or now - self._loaded_at > self.ttl:
+            self._stale = False  # cleared first: an invalidate during the load still counts
+            value = self.loader()
+            if value != self._value:
+                self._value = value
+                self._index = None
+            self._loaded_at = now
+        return self._value
+
+    def get(self):
+        with self._lock:
+            return self._refresh()
+
+    def index(self) -> AutocompleteIndex:
+        with self._lock:
+            entries = self._refresh()
+            if self._index is None:
+                self._index = AutocompleteIndex(entries)
+            return self._index
+
+    def invalidate(self):
+        self._stale = True
+
+_sources = {}
+
+def register_source(name: str, loader, ttl: float = 10.0):
+    _sources[name] = CachedSource(loader, ttl)
+    return _sources[name]
+
+def get_cached(name: str):
+    return _sources[name].get()
+
+def search(name: str, query: str, limit: int = MAX_CHOICES):
+    return _sources[name].index().search(query, limit)
+
+def invalidate(name: str = None):
+    for key, source in _sources.items():
+        if name is None or key == name:
+            source.invalidate()
+
+# --- BUILT-IN SOURCES ---
+
+def list_reloadable_modules():
+    modules = []
+    # Scan cogs and utils (for /reload)
+    for folder in ('cogs', 'utils'):
+        if os.path.exists(f'./{folder}'):
+            for filename in sorted(os.listdir(f'./{folder}')):
+                if filename.endswith('.py'):
+                    name = f"{folder}.{filename[:-3]}"
+                    modules.append((name, name))
+    return modules
+
+register_source("quizzes", lambda: list(get_quiz_lookup().items()), ttl=5.0)
+register_source("sessions", lambda: [(s['label'], s['id']) for s in get_session_lookup(limit=25)], ttl=10.0)
+register_source("powerups", lambda: [(p.name, p.name) for p in get_powerup_registry().powerups], ttl=30.0)
+register_source("session_count", get_total_session_count, ttl=10.0)
+register_source("modules", list_reloadable_modules, ttl=60.0)
@@ -1,6 +1,7 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Dict, Any
-import random
+import bisect
+import os
 
 class EffectType:
     MULTIPLIER = "multiplier"       
@@ -44,7 +45,64 @@ class Question:
     explanation: Optional[str] = None
     image_url: Optional[str] = None
     allow_multi_select: bool = False
-    def to_dict(self): return self.__dict__
+    # Only the authored fields (CompiledQuestion adds derived ones that must not be saved)
+    def to_dict(self): return {f.name: getattr(self, f.name) for f in fields(Question)}
+
+BUTTON_LABEL_LEN = 75
+
+@dataclass
+class CompiledQuestion(Question):
+    # Read-only game form of a Question, built once by load_quiz.
+    # Everything the answer/timeout/render paths used to recompute per click lives here.
+    correct_set: frozenset = field(init=False, repr=False, compare=False)
+    wrong_indices: tuple = field(init=False, repr=False, compare=False)
+    answer_str: str = field(init=False, repr=False, compare=False)
+    answer_field_name: str = field(init=False, repr=False, compare=False)
+    type_text: str = field(init=False, repr=False, compare=False)
+    option_labels: tuple = field(init=False, repr=False, compare=False)
+    # image_kind: None | "url" | "file" | "missing"
+    image_kind: Optional[str] = field(init=False, repr=False, compare=False)
+    image_path: Optional[str] = field(init=False, repr=False, compare=False)
+    image_filename: Optional[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        valid = [i for i in self.correct_indices if 0 <= i < len(self.options)]
+        self.correct_set = frozenset(valid)
+        self.wrong_indices = tuple(i for i in range(len(self.options)) if i not in self.correct_set)
+        if self.type == QuestionType.REORDER:
+            self.answer_str = " -> ".join(self.options[i] for i in valid)
+            self.answer_field_name = "Correct Sequence"
+            self.type_text = "(Order Sequence)"
+        else:
+            self.answer_str = ", ".join(self.options[i] for i in valid)
+            self.answer_field_name = "Correct Answer"
+            self.type_text = "(Multi-Select)" if self.allow_multi_select else ""
+        self.option_labels = tuple(str(opt)[:BUTTON_LABEL_LEN] for opt in self.options)
+        self._resolve_image()
+
+    def _resolve_image(self):
+        self.image_kind = self.image_path = self.image_filename = None
+        if not self.image_url: return
+        if self.image_url.lower().startswith(("http://", "https://")):
+            self.image_kind = "url"
+        elif os.path.exists(self.image_url):
+            self.image_kind = "file"
+            self.image_path = os.path.abspath(self.image_url)
+            # Safe, generic attachment name (local filenames may have spaces/special chars)
+            ext = os.path.splitext(self.image_url)[1] or ".png"
+            self.image_filename = f"quiz_image{ext}"
+        else:
+            self.image_kind = "missing"
+
+    def is_correct(self, orig_indices) -> bool:
+        if self.type == QuestionType.REORDER:
+            return list(orig_indices) == self.correct_indices
+        return set(orig_indices) == self.correct_set
+
+    @classmethod
+    def from_question(cls, q: Question):
+        if isinstance(q, cls): return q
+        return cls(**q.to_dict())
 
 @dataclass
 class Player:
@@ -110,6 +168,60 @@ class Quiz:
             "questions": [q.to_dict() for q in self.questions],
         }
 
+class RankIndex:
+    # Live ranking for a GameSession: a sorted list of (-score, join_seq, user_id)
+    # kept up to date on every score change, so rank lookups are a bisect
+    # instead of sorting all players. Ties go to whoever joined first (same
+    # order the old sorted(players.values()) gave).
+    # Lookups are O(log n); a score change is a bisect plus a list delete /
+    # insort, which shifts the list (O(n) memmove). That's deliberate: with a
+    # few hundred players at most it beats a tree/skiplist dependency, and it's
+    # still far cheaper than the full O(n log n) re-sort it replaced.
+    def __init__(self):
+        self._keys = []
+        self._by_user = {}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _drop(self, key):
+        del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def add(self, user_id, score):
+        if user_id in self._by_user:
+            self.update(user_id, score)
+            return
+        key = (-score, self._seq, user_id)
+        self._seq += 1
+        bisect.insort(self._keys, key)
+        self._by_user[user_id] = key
+
+    def update(self, user_id, score):
+        old = self._by_user.get(user_id)
+        if old is None:
+            self.add(user_id, score)
+            return
+        if old[0] == -score: return
+        self._drop(old)
+        key = (-score, old[1], user_id)
+        bisect.insort(self._keys, key)
+        self._by_user[user_id] = key
+
+    def remove(self, user_id):
+        key = self._by_user.pop(user_id, None)
+        if key: self._drop(key)
+
+    def rank(self, user_id) -> int:
+        # 1-based, 0 if the user isn't ranked
+        key = self._by_user.get(user_id)
+        if key is None: return 0
+        return bisect.bisect_left(self._keys, key) + 1
+
+    def top(self, k=None) -> List[int]:
+        keys = self._keys if k is None else self._keys[:k]
+        return [user_id for _, _, user_id in keys]
+
 class GameSession:
     def __init__(self, channel_id, quiz: Quiz):
         self.channel_id = channel_id
@@ -134,6 +246,39 @@ class GameSession:
         self.last_bump_time = 0
         self.message_counter = 0
 
+        self.ranks = RankIndex()
+
+        # Live dashboard refresh (runtime only): last rendered signature and
+        # the adaptive schedule used by Gameplay.dashboard_update
+        self.dashboard_sig = None
+        self.dashboard_next = 0.0
+        self.dashboard_interval = 0.0
+
+    # --- PLAYERS / SCORES ---
+    # Go through these (not session.players / player.score directly) so the
+    # rank index stays in sync.
+    def add_player(self, player: Player):
+        self.players[player.user_id] = player
+        self.ranks.add(player.user_id, player.score)
+
+    def remove_player(self, user_id) -> Optional[Player]:
+        self.ranks.remove(user_id)
+        return self.players.pop(user_id, None)
+
+    def set_score(self, player: Player, score: int):
+        player.score = score
+        self.ranks.update(player.user_id, score)
+
+    def add_score(self, player: Player, points: int):
+        self.set_score(player, player.score + points)
+
+    def rank_of(self, player: Player) -> int:
+        return self.ranks.rank(player.user_id)
+
+    def top_players(self, k=None) -> List[Player]:
+        # Players by score, highest first (all of them when k is None)
+        return [self.players[uid] for uid in self.ranks.top(k)]
+
     def to_dict(self):
         return {
             "channel_id": self.channel_id,
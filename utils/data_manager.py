@@ -1,11 +1,26 @@
+import asyncio
+import copy
 import json
 import os
-from .classes import Quiz, Question, CustomPowerUp, EffectType
+import tempfile
+import threading
+from functools import wraps
+from collections import OrderedDict
+from dataclasses import dataclass
+from .classes import Quiz, Question, CompiledQuestion, CustomPowerUp, EffectType
+from . import quiz_store
 
 DATA_DIR = "data"
 QUIZ_DIR = os.path.join(DATA_DIR, "quizzes")
 POWERUP_FILE = os.path.join(DATA_DIR, "powerups.json")
 
+# "json" = one file per quiz in data/quizzes (default)
+# "sqlite" = single indexed store (utils/quiz_store.py, data/quiz_store.db)
+QUIZ_STORAGE = os.getenv("QUIZ_STORAGE", "json").lower()
+
+def _use_store() -> bool:
+    return QUIZ_STORAGE == "sqlite"
+
 def ensure_dirs():
     if not os.path.exists(QUIZ_DIR):
         os.makedirs(QUIZ_DIR)
@@ -26,28 +41,261 @@ DEFAULT_POWERUPS = [
     CustomPowerUp("Glitch", "Glitch everyone's screen (10s)", EffectType.GLITCH, 0, "👾")
 ]
 
-def save_quiz(quiz: Quiz):
-    filename = f"{quiz.name.replace(' ', '_').lower()}.json"
+# --- QUIZ CATALOG ---
+# Process-wide index of data/quizzes (name -> file + stats). Only files whose
+# directory entry, mtime or size changed since the last scan are re-parsed.
+# In sqlite mode the catalog mirrors the store's index columns and is only
+# rescanned when another process committed to it; mtime is then updated_at.
+
+@dataclass
+class QuizCatalogEntry:
+    name: str
+    filename: str
+    question_count: int
+    mtime: float
+    size: int
+
+_catalog: dict = {}  # filename -> QuizCatalogEntry
+
+# Catalog, revisions, parsed cache and pending writes are shared between the
+# event loop and the utils.aio I/O threads. _quiz_lock is held across disk I/O,
+# so the event loop never takes it (see save_quiz(defer=True)); _pending_lock
+# only guards the pending-write / timer / revision dicts and is never held
+# across I/O. Lock order: _quiz_lock, then _pending_lock.
+_quiz_lock = threading.RLock()
+_pending_lock = threading.Lock()
+
+def _locked(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _quiz_lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+# Per-quiz revision counter, bumped on every save/delete through this module and
+# whenever a scan notices the file changed on disk. Readers compare it instead
+# of touching the filesystem.
+_revisions: dict = {}  # filename -> int
+
+def get_quiz_revision(name: str) -> int:
+    filename = name if name.endswith(".json") else _resolve_filename(name)
+    return _revisions.get(filename, 0)
+
+def _bump_revision(filename):
+    with _pending_lock:
+        _revisions[filename] = _revisions.get(filename, 0) + 1
+
+def _read_catalog_entry(filename, st):
+    with open(os.path.join(QUIZ_DIR, filename), 'r') as f:
+        data = json.load(f)
+    return QuizCatalogEntry(data['name'], filename, len(data.get('questions', [])), st.st_mtime, st.st_size)
+
+def _update_catalog_entry(filename):
     path = os.path.join(QUIZ_DIR, filename)
-    with open(path, 'w') as f:
-        json.dump(quiz.to_dict(), f, indent=4)
+    try:
+        _catalog[filename] = _read_catalog_entry(filename, os.stat(path))
+    except Exception:
+        _catalog.pop(filename, None)
 
-def load_quiz(name: str) -> Quiz:
+def _refresh_from_store():
+    if not quiz_store.has_changed(): return _catalog
+    seen = set()
+    for row in quiz_store.list_entries():
+        seen.add(row['filename'])
+        cached = _catalog.get(row['filename'])
+        if cached and cached.mtime == row['updated_at'] and cached.size == row['size']:
+            continue
+        _bump_revision(row['filename'])
+        _catalog[row['filename']] = QuizCatalogEntry(row['name'], row['filename'], row['question_count'], row['updated_at'], row['size'])
+    for filename in list(_catalog):
+        if filename not in seen: del _catalog[filename]
+    return _catalog
+
+@_locked
+def refresh_quiz_catalog():
+    if _use_store(): return _refresh_from_store()
+    if not os.path.exists(QUIZ_DIR):
+        _catalog.clear()
+        return _catalog
+    seen = set()
+    with os.scandir(QUIZ_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".json") or not entry.is_file(): continue
+            seen.add(entry.name)
+            st = entry.stat()
+            cached = _catalog.get(entry.name)
+            if cached and cached.mtime == st.st_mtime and cached.size == st.st_size:
+                continue
+            _bump_revision(entry.name)
+            try:
+                _catalog[entry.name] = _read_catalog_entry(entry.name, st)
+            except Exception:
+                _catalog.pop(entry.name, None)
+    for filename in list(_catalog):
+        if filename not in seen: del _catalog[filename]
+    return _catalog
+
+@_locked
+def get_quiz_catalog():
+    return list(refresh_quiz_catalog().values())
+
+def _resolve_filename(name: str) -> str:
     quiz_map = get_quiz_lookup()
-    if name in quiz_map: 
-        filename = quiz_map[name]
+    if name in quiz_map:
+        return quiz_map[name]
+    return name if name.endswith(".json") else f"{name}.json"
+
+def quiz_filename(quiz: Quiz) -> str:
+    return f"{quiz.name.replace(' ', '_').lower()}.json"
+
+# --- PARSED QUIZ CACHE ---
+# LRU of parsed Quiz objects keyed by filename + mtime + revision. Cached
+# quizzes are shared between every GameSession playing them, so treat them as
+# read-only; the editor asks for its own copy with load_quiz(name, editable=True).
+QUIZ_CACHE_SIZE = 32
+
+_quiz_cache = OrderedDict()  # filename -> (mtime, revision, Quiz)
+_quiz_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def get_quiz_cache_stats():
+    return {**_quiz_cache_stats, "size": len(_quiz_cache), "capacity": QUIZ_CACHE_SIZE}
+
+def _cache_quiz(filename, mtime, quiz):
+    _quiz_cache[filename] = (mtime, _revisions.get(filename, 0), quiz)
+    _quiz_cache.move_to_end(filename)
+    while len(_quiz_cache) > QUIZ_CACHE_SIZE:
+        _quiz_cache.popitem(last=False)
+        _quiz_cache_stats["evictions"] += 1
+
+# --- QUIZ PERSISTENCE ---
+# Files are replaced atomically (temp file + rename) so a crash mid-write never
+# leaves a truncated quiz. Editor saves pass defer=True: the quiz is marked
+# dirty and written once after QUIZ_WRITE_DELAY, however many edits land in
+# between. load_quiz() flushes a pending write first so reads see the edits.
+# The pending entry is a deep-copied to_dict() snapshot taken on the loop: the
+# editor keeps mutating the live Quiz while the write runs on an I/O thread.
+QUIZ_WRITE_DELAY = 2.0
+
+_pending_writes = {}  # filename -> quiz dict snapshot
+_flush_handles = {}   # filename -> (loop, asyncio.TimerHandle)
+_flush_tasks = set()
+
+def _atomic_write_json(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+def _write_quiz_file(filename, data):
+    if _use_store():
+        updated_at, size = quiz_store.put(filename, data)
+        _catalog[filename] = QuizCatalogEntry(data["name"], filename, len(data["questions"]), updated_at, size)
+        return
+    _atomic_write_json(os.path.join(QUIZ_DIR, filename), data)
+    _update_catalog_entry(filename)
+
+def save_quiz(quiz: Quiz, defer: bool = False):
+    filename = quiz_filename(quiz)
+    if defer:
+        try: loop = asyncio.get_running_loop()
+        except RuntimeError: loop = None
+        if loop:
+            # Editor path, on the event loop: no _quiz_lock, so it never waits
+            # behind a catalog scan or file write running on an I/O thread
+            data = copy.deepcopy(quiz.to_dict())
+            with _pending_lock:
+                _revisions[filename] = _revisions.get(filename, 0) + 1
+                _pending_writes[filename] = data
+                if filename not in _flush_handles:
+                    _flush_handles[filename] = (loop, loop.call_later(QUIZ_WRITE_DELAY, _flush_in_background, loop, filename))
+            entry = _catalog.get(filename)
+            if entry: entry.question_count = len(quiz.questions)
+            return
+    _save_quiz_now(filename, quiz)
+
+@_locked
+def _save_quiz_now(filename, quiz):
+    _bump_revision(filename)
+    _cancel_pending_write(filename)
+    _write_quiz_file(filename, quiz.to_dict())
+
+def _cancel_pending_write(filename):
+    with _pending_lock:
+        timer = _flush_handles.pop(filename, None)
+        data = _pending_writes.pop(filename, None)
+    if timer:
+        # TimerHandle isn't thread-safe: cancel on its own loop
+        loop, handle = timer
+        try: running = asyncio.get_running_loop()
+        except RuntimeError: running = None
+        if running is loop: handle.cancel()
+        else:
+            try: loop.call_soon_threadsafe(handle.cancel)
+            except RuntimeError: pass # loop already closed
+    return data
+
+def _flush_in_background(loop, filename):
+    # Timer callback (on the loop): hand the write to the bounded I/O pool.
+    # Imported here because utils.aio imports this module.
+    from . import aio
+    task = loop.create_task(aio.run_io(flush_quiz_writes, filename))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_done)
+
+def _flush_done(task):
+    _flush_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f"Deferred quiz flush failed: {task.exception()}")
+
+@_locked
+def flush_quiz_writes(filename: str = None):
+    with _pending_lock: pending = [filename] if filename else list(_pending_writes)
+    for fn in pending:
+        data = _cancel_pending_write(fn)
+        if data is not None:
+            try: _write_quiz_file(fn, data)
+            except Exception as e: print(f"Failed to write quiz {fn}: {e}")
+
+@_locked
+def load_quiz(name: str, editable: bool = False) -> Quiz:
+    filename = _resolve_filename(name)
+    if filename in _pending_writes: flush_quiz_writes(filename)
+    entry = _catalog.get(filename)
+    cached = _quiz_cache.get(filename)
+    if entry and cached and cached[0] == entry.mtime and cached[1] == _revisions.get(filename, 0):
+        _quiz_cache.move_to_end(filename)
+        _quiz_cache_stats["hits"] += 1
+        quiz = cached[2]
     else:
-        filename = name if name.endswith(".json") else f"{name}.json"
-        
+        data = _read_quiz_data(filename)
+        if data is None: return None
+        _quiz_cache_stats["misses"] += 1
+        quiz = _quiz_from_dict(data, compiled=True)
+        if entry: _cache_quiz(filename, entry.mtime, quiz)
+    # The editor gets plain, independent Questions; games share the compiled instance
+    return _quiz_from_dict(copy.deepcopy(quiz.to_dict())) if editable else quiz
+
+def _read_quiz_data(filename):
+    if _use_store():
+        return quiz_store.get_data(filename)
     path = os.path.join(QUIZ_DIR, filename)
     if not os.path.exists(path): return None
-    
     with open(path, 'r') as f:
-        data = json.load(f)
-        
+        return json.load(f)
+
+def _quiz_from_dict(data, compiled: bool = False) -> Quiz:
+    q_cls = CompiledQuestion if compiled else Question
     q_objs = []
     for q_data in data['questions']:
-        q = Question(
+        q = q_cls(
             text=q_data['text'],
             options=q_data['options'],
             correct_indices=q_data['correct_indices'],
@@ -59,22 +307,28 @@ def load_quiz(name: str) -> Quiz:
             allow_multi_select=q_data.get('allow_multi_select', False)
         )
         q_objs.append(q)
+        if compiled and q.image_kind == "missing":
+            # Flagged once per load instead of on every render
+            print(f"⚠️ [WARNING] Quiz '{data['name']}' Q{len(q_objs)}: image not found at path: {q.image_url}")
         
     return Quiz(data['name'], data['creator_id'], q_objs)
 
+@_locked
 def get_quiz_lookup():
-    if not os.path.exists(QUIZ_DIR): return {}
-    files = [f for f in os.listdir(QUIZ_DIR) if f.endswith(".json")]
-    lookup = {}
-    for f in files:
-        try:
-            with open(os.path.join(QUIZ_DIR, f), 'r') as file:
-                data = json.load(file)
-                lookup[data['name']] = f
-        except: continue
-    return lookup
+    return {entry.name: entry.filename for entry in refresh_quiz_catalog().values()}
 
-def load_powerups():
+# --- POWERUP REGISTRY ---
+# powerups.json is read once and indexed by name. Joins, loot
+# rolls and autocomplete read from memory; save_all_powerups invalidates it.
+
+class PowerupRegistry:
+    def __init__(self, powerups):
+        self.powerups = list(powerups)
+        self.by_name = {p.name: p for p in self.powerups}
+
+_powerup_registry = None
+
+def _read_powerups_file():
     if not os.path.exists(POWERUP_FILE):
         return DEFAULT_POWERUPS
     try:
@@ -84,21 +338,43 @@ def load_powerups():
     except:
         return DEFAULT_POWERUPS
 
+def get_powerup_registry() -> PowerupRegistry:
+    global _powerup_registry
+    if _powerup_registry is None:
+        _powerup_registry = PowerupRegistry(_read_powerups_file())
+    return _powerup_registry
+
+def invalidate_powerups():
+    global _powerup_registry
+    _powerup_registry = None
+
+def load_powerups():
+    # Copy so callers can build a new list to pass to save_all_powerups
+    return list(get_powerup_registry().powerups)
+
+def get_powerup(name: str):
+    return get_powerup_registry().by_name.get(name)
+
 # --- NEW FUNCTION ---
 def save_all_powerups(powerups_list):
     data = [p.to_dict() for p in powerups_list]
     with open(POWERUP_FILE, 'w') as f:
         json.dump(data, f, indent=4)
+    invalidate_powerups()
         
+@_locked
 def delete_quiz_file(name: str) -> bool:
-    quiz_map = get_quiz_lookup()
-    if name in quiz_map:
-        filename = quiz_map[name]
+    filename = _resolve_filename(name)
+    _cancel_pending_write(filename)
+    if _use_store():
+        deleted = quiz_store.delete(filename)
     else:
-        filename = name if name.endswith(".json") else f"{name}.json"
-    
-    path = os.path.join(QUIZ_DIR, filename)
-    if os.path.exists(path):
-        os.remove(path)
+        path = os.path.join(QUIZ_DIR, filename)
+        deleted = os.path.exists(path)
+        if deleted: os.remove(path)
+    if deleted:
+        _bump_revision(filename)
+        _catalog.pop(filename, None)
+        _quiz_cache.pop(filename, None)
         return True
-    return False
\ No newline at end of file
+    return False
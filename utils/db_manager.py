@@ -1,23 +1,343 @@
 import sqlite3
+import hashlib
 import json
 import os
+import queue
+import threading
 import time
-from .classes import Quiz, Question, CustomPowerUp, EffectType
+from concurrent.futures import Future
+from functools import wraps
+
+# /reload utils.db_manager re-executes this module in its existing namespace,
+# which would rebind the writer / connection globals below and leak the running
+# writer thread and open connections. Shut them down first (queued writes still
+# run); everything restarts lazily, and setup_database() below reopens the writer.
+if "close_db" in globals():
+    globals()["close_db"]()
 
 DB_FILE = "data/quiz_history.db"
 
+# --- CONNECTIONS ---
+# Reads use one connection per thread; all writes go through a single writer
+# thread (see WRITER below). WAL lets readers (/leaderboard, /history,
+# autocomplete) run against the last committed snapshot while a game report
+# is being written. open_db()/close_db() are called from the bot's
+# setup_hook/close; everything also starts lazily so scripts can use this
+# module directly.
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",   # 256 MB memory-mapped reads
+    "PRAGMA cache_size=-16000",     # ~16 MB page cache per connection
+)
+
+_readers = threading.local()
+_open_conns = []
+_conns_lock = threading.Lock()
+_generation = 0  # bumped by close_db so threads drop their stale readers
+
 def get_connection():
-    conn = sqlite3.connect(DB_FILE)
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    with _conns_lock:
+        _open_conns.append(conn)
     return conn
 
-def setup_database():
+def _read_conn():
+    cached = getattr(_readers, "conn", None)
+    if cached is None or cached[0] != _generation:
+        conn = get_connection()
+        conn.execute("PRAGMA query_only=ON")
+        _readers.conn = cached = (_generation, conn)
+    return cached[1]
+
+# --- WRITER ---
+# One thread owns the write connection and drains _write_queue. Jobs that are
+# queued together share a transaction (one commit / fsync); each job runs in
+# its own SAVEPOINT so a failing job is rolled back without losing the others.
+# Callers get a concurrent.futures.Future, resolved after the commit.
+WRITE_BATCH_MAX = 64
+
+_write_queue = queue.Queue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+_writer_stats = {"jobs": 0, "batches": 0, "failed": 0, "max_batch": 0,
+                 "last_commit_ms": 0.0, "total_commit_ms": 0.0}
+
+_job_hooks = []  # after_commit callbacks of the job currently running (writer thread only)
+
+def after_commit(callback):
+    # Called from inside a write job: run callback once the batch is committed
+    # (skipped if the job is rolled back). Used to keep in-memory mirrors in sync.
+    _job_hooks.append(callback)
+
+def _run_batch(conn, batch):
+    results = []
+    hooks = []
+    c = conn.cursor()
+    conn.execute("BEGIN IMMEDIATE")
+    for func, args, kwargs, future in batch:
+        c.execute("SAVEPOINT job")
+        _job_hooks.clear()
+        try:
+            results.append((future, func(c, *args, **kwargs), None))
+            c.execute("RELEASE job")
+            hooks.extend(_job_hooks)
+        except Exception as e:
+            c.execute("ROLLBACK TO job")
+            c.execute("RELEASE job")
+            results.append((future, None, e))
+    _job_hooks.clear()
+    t0 = time.perf_counter()
+    conn.commit()
+    commit_ms = (time.perf_counter() - t0) * 1000
+    # Before futures resolve, so callers see their own change immediately
+    for hook in hooks:
+        try: hook()
+        except Exception as e: print(f"after_commit hook failed: {e}")
+    return results, commit_ms
+
+def _writer_loop():
+    conn = get_connection()
+    conn.isolation_level = None  # explicit BEGIN/COMMIT
+    while True:
+        job = _write_queue.get()
+        if job is None: break
+        batch = [job]
+        stop = False
+        while len(batch) < WRITE_BATCH_MAX:
+            try: job = _write_queue.get_nowait()
+            except queue.Empty: break
+            if job is None:
+                stop = True
+                break
+            batch.append(job)
+        try:
+            results, commit_ms = _run_batch(conn, batch)
+        except Exception as e:
+            # Commit (or BEGIN) itself failed: nothing in the batch was applied
+            try: conn.rollback()
+            except Exception: pass
+            results, commit_ms = [(f, None, e) for _, _, _, f in batch], 0.0
+        _writer_stats["jobs"] += len(batch)
+        _writer_stats["batches"] += 1
+        _writer_stats["max_batch"] = max(_writer_stats["max_batch"], len(batch))
+        _writer_stats["last_commit_ms"] = commit_ms
+        _writer_stats["total_commit_ms"] += commit_ms
+        for future, result, error in results:
+            if error is not None:
+                _writer_stats["failed"] += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        if stop: break
+
+def _ensure_writer():
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_writer_loop, name="quiz-db-writer", daemon=True)
+            _writer_thread.start()
+
+def submit_write(func, *args, **kwargs) -> Future:
+    future = Future()
+    if threading.current_thread() is _writer_thread:
+        # Nested write from inside a job: it is already in the open transaction
+        future.set_exception(RuntimeError("write jobs cannot submit other write jobs"))
+        return future
+    _ensure_writer()
+    _write_queue.put((func, args, kwargs, future))
+    return future
+
+def write_job(func):
+    # func(c, *args) runs on the writer thread. The decorated name keeps the
+    # old blocking call signature (without `c`); `.submit(...)` returns the Future.
+    @wraps(func)
+    def blocking(*args, **kwargs):
+        return submit_write(func, *args, **kwargs).result()
+    blocking.submit = lambda *args, **kwargs: submit_write(func, *args, **kwargs)
+    return blocking
+
+def get_writer_stats():
+    stats = dict(_writer_stats)
+    stats["queue_depth"] = _write_queue.qsize()
+    stats["avg_commit_ms"] = stats["total_commit_ms"] / stats["batches"] if stats["batches"] else 0.0
+    stats["alive"] = bool(_writer_thread and _writer_thread.is_alive())
+    return stats
+
+def open_db():
+    setup_database()
+    load_bans()
+
+def close_db():
+    global _writer_thread, _generation
+    with _writer_lock:
+        if _writer_thread is not None and _writer_thread.is_alive():
+            _write_queue.put(None)  # queued jobs before this still run
+            _writer_thread.join()
+        _writer_thread = None
+    with _conns_lock:
+        for conn in _open_conns:
+            try: conn.close()
+            except Exception: pass
+        _open_conns.clear()
+    _generation += 1
+
+# --- INDEXES ---
+# Secondary indexes for the history schema (created idempotently by setup_database).
+# check_query_plans() verifies the queries below actually use them (/debug -> DB Query Plans).
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_players_session ON players(session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_players_user_session ON players(user_id, session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_answers_player_question ON answers(player_db_id, question_index)",
+    "CREATE INDEX IF NOT EXISTS idx_powerup_usage_session ON powerup_usage(session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date_played)",
+    "CREATE INDEX IF NOT EXISTS idx_moderation_logs_timestamp ON moderation_logs(timestamp)",
+    # All-time leaderboard: one index per sort mode so top-K is an index walk
+    "CREATE INDEX IF NOT EXISTS idx_user_totals_avg ON user_totals(avg_score DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_user_totals_accuracy ON user_totals(accuracy DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_user_totals_total ON user_totals(total_score DESC)",
+)
+# Indexes earlier versions created that no query reads any more (dropped so
+# inserts stop maintaining them). question_stats is range-scanned on its
+# session_id primary key; roundup groups by +question_key on purpose.
+RETIRED_INDEXES = ("idx_question_stats_key",)
+
+# --- QUERIES ---
+# Shared between the functions below and check_query_plans(). Leaderboard and
+# roundup take a session selection as a single lower bound (session_id >= ?,
+# see get_session_bound), so they stay one short statement however much
+# history is selected. The unary + in "GROUP BY +col" keeps SQLite from walking
+# a whole index in group order instead of range-searching on session_id.
+SQL_LEADERBOARD = '''
+        SELECT name, SUM(score) as total_score, SUM(correct_count) as total_correct,
+        SUM(correct_count + incorrect_count) as total_attempts, COUNT(session_id) as games_played
+        FROM players p
+        LEFT JOIN banned_users b ON b.user_id = p.user_id
+        WHERE p.session_id >= ?
+        AND b.user_id IS NULL
+        GROUP BY +p.user_id
+    '''
+SQL_ROUNDUP_UNIQUE_USERS = "SELECT COUNT(DISTINCT user_id) FROM players WHERE session_id >= ?"
+SQL_ROUNDUP_ANSWERED = "SELECT SUM(correct_count + incorrect_count) FROM players WHERE session_id >= ?"
+SQL_ROUNDUP_TOP_POWERUP = "SELECT powerup_name, COUNT(*) as cnt FROM powerup_usage WHERE session_id >= ? GROUP BY powerup_name ORDER BY cnt DESC LIMIT 1"
+# Easiest/hardest: reads question_stats (a few rows per session), grouped by
+# question identity rather than text
+SQL_ROUNDUP_QUESTIONS = '''SELECT MAX(question_text), SUM(correct_count) * 1.0 / SUM(attempts) as acc FROM question_stats
+        WHERE session_id >= ? AND attempts > 0 GROUP BY +question_key ORDER BY acc DESC'''
+SQL_ROUNDUP_TOP_QUIZ = '''SELECT quiz_name, SUM(total_players) as total_p FROM sessions
+        WHERE session_id >= ? GROUP BY quiz_name ORDER BY total_p DESC LIMIT 1'''
+# One pass for /history, /results and the post-game report: every player of
+# the session with their answers, ordered by player then question.
+# LEFT JOIN keeps players that never answered; banned users are dropped in
+# Python against the in-memory ban set.
+SQL_SESSION_REPORT = '''SELECT p.id AS player_db_id, p.user_id, p.name, p.score, p.correct_count, p.incorrect_count, p.total_time_taken,
+               a.question_index, a.question_text, a.is_correct, a.time_taken, a.chosen_text
+        FROM players p
+        LEFT JOIN answers a ON a.player_db_id = p.id
+        WHERE p.session_id = ?
+        ORDER BY p.score DESC, p.id, a.question_index, a.id'''
+SQL_DELETE_SESSION_ANSWERS = "DELETE FROM answers WHERE player_db_id IN (SELECT id FROM players WHERE session_id = ?)"
+SQL_DELETE_RANGE_ANSWERS = "DELETE FROM answers WHERE player_db_id IN (SELECT id FROM players WHERE session_id BETWEEN ? AND ?)"
+SQL_MODERATION_HISTORY = "SELECT * FROM moderation_logs ORDER BY timestamp DESC LIMIT ?"
+SQL_USER_LAST_STATS = '''
+        SELECT p.score, p.rank, p.correct_count, s.quiz_name, s.total_questions
+        FROM players p
+        JOIN sessions s ON p.session_id = s.session_id
+        WHERE p.user_id = ? AND p.unattempted_count = 0
+        ORDER BY s.date_played DESC
+        LIMIT 1
+    '''
+
+# --- USER TOTALS ---
+# Upsert one finished game into user_totals. In DO UPDATE, bare column names are
+# the old values, so avg/accuracy are computed from old + excluded.
+SQL_ADD_USER_TOTALS = '''INSERT INTO user_totals (user_id, name, total_score, total_correct, total_attempts, games_played, avg_score, accuracy)
+        VALUES (?1, ?2, ?3, ?4, ?5, 1, ?3,
+                CASE WHEN ?5 > 0 THEN ?4 * 100.0 / ?5 ELSE 0.0 END)
+        ON CONFLICT(user_id) DO UPDATE SET
+            name = excluded.name,
+            total_score = total_score + excluded.total_score,
+            total_correct = total_correct + excluded.total_correct,
+            total_attempts = total_attempts + excluded.total_attempts,
+            games_played = games_played + 1,
+            avg_score = (total_score + excluded.total_score) * 1.0 / (games_played + 1),
+            accuracy = CASE WHEN total_attempts + excluded.total_attempts > 0
+                            THEN (total_correct + excluded.total_correct) * 100.0 / (total_attempts + excluded.total_attempts)
+                            ELSE 0.0 END'''
+
+# Recompute user_totals rows from players for the given {placeholder} user ids
+SQL_RECOMPUTE_USER_TOTALS = '''INSERT OR REPLACE INTO user_totals (user_id, name, total_score, total_correct, total_attempts, games_played, avg_score, accuracy)
+        SELECT user_id, name, SUM(score), SUM(correct_count), SUM(correct_count + incorrect_count), COUNT(session_id),
+               SUM(score) * 1.0 / COUNT(session_id),
+               CASE WHEN SUM(correct_count + incorrect_count) > 0
+                    THEN SUM(correct_count) * 100.0 / SUM(correct_count + incorrect_count) ELSE 0.0 END
+        FROM players {where}
+        GROUP BY user_id'''
+
+TOTALS_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+def _recompute_user_totals(c, user_ids):
+    user_ids = list(set(user_ids))
+    for i in range(0, len(user_ids), TOTALS_CHUNK):
+        chunk = user_ids[i:i + TOTALS_CHUNK]
+        placeholder = ",".join("?" for _ in chunk)
+        c.execute(f"DELETE FROM user_totals WHERE user_id IN ({placeholder})", chunk)
+        c.execute(SQL_RECOMPUTE_USER_TOTALS.format(where=f"WHERE user_id IN ({placeholder})"), chunk)
+
+def _rebuild_user_totals(c):
+    c.execute("DELETE FROM user_totals")
+    c.execute(SQL_RECOMPUTE_USER_TOTALS.format(where=""))
+    return c.execute("SELECT COUNT(*) FROM user_totals").fetchone()[0]
+
+rebuild_user_totals = write_job(_rebuild_user_totals)
+
+# --- QUESTION STATS ---
+# answers.question_key identifies a question across games: hash of quiz name +
+# question text, so the same question keeps its key if the quiz is reordered and
+# two quizzes sharing a question's text stay apart.
+# question_stats holds one row per (session, question) with attempts / correct /
+# time totals; written by save_report_rows, refreshed by adjust_session_question.
+def question_key(quiz_name, question_text):
+    return hashlib.sha1(f"{quiz_name}\x1f{question_text}".encode("utf-8")).hexdigest()[:16]
+
+SQL_RECOMPUTE_QUESTION_STATS = '''INSERT OR REPLACE INTO question_stats (session_id, question_index, question_key, question_text, attempts, correct_count, time_sum)
+        SELECT p.session_id, a.question_index, MAX(a.question_key), MAX(a.question_text), COUNT(*), SUM(a.is_correct), SUM(a.time_taken)
+        FROM answers a JOIN players p ON p.id = a.player_db_id
+        {where}
+        GROUP BY p.session_id, a.question_index'''
+
+def _recompute_question_stats(c, session_id):
+    c.execute("DELETE FROM question_stats WHERE session_id = ?", (session_id,))
+    c.execute(SQL_RECOMPUTE_QUESTION_STATS.format(where="WHERE p.session_id = ?"), (session_id,))
+
+def _rebuild_question_stats(c):
+    # Old rows predate question_key: derive it from the session's quiz name
+    c.execute('''SELECT a.id, s.quiz_name, a.question_text FROM answers a
+                 JOIN players p ON p.id = a.player_db_id JOIN sessions s ON s.session_id = p.session_id
+                 WHERE a.question_key IS NULL''')
+    c.executemany("UPDATE answers SET question_key = ? WHERE id = ?",
+                  [(question_key(r[1], r[2]), r[0]) for r in c.fetchall()])
+    c.execute("DELETE FROM question_stats")
+    c.execute(SQL_RECOMPUTE_QUESTION_STATS.format(where=""))
+    return c.execute("SELECT COUNT(*) FROM question_stats").fetchone()[0]
+
+rebuild_question_stats = write_job(_rebuild_question_stats)
+
+def _session_user_ids(c, low, high):
+    c.execute("SELECT DISTINCT user_id FROM players WHERE session_id BETWEEN ? AND ?", (low, high))
+    return [row[0] for row in c.fetchall()]
+
+@write_job
+def setup_database(c):
     if not os.path.exists("data"):
         os.makedirs("data")
         
-    conn = get_connection()
-    c = conn.cursor()
-    
     c.execute('''CREATE TABLE IF NOT EXISTS sessions (
         session_id INTEGER PRIMARY KEY AUTOINCREMENT,
         quiz_name TEXT,
@@ -28,7 +348,7 @@ def setup_database():
         avg_accuracy REAL,
         results_sent INTEGER DEFAULT 0
     )''')
-    
+
     c.execute('''CREATE TABLE IF NOT EXISTS players (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         session_id INTEGER,
@@ -44,7 +364,7 @@ def setup_database():
         total_time_taken REAL,
         FOREIGN KEY(session_id) REFERENCES sessions(session_id)
     )''')
-    
+
     c.execute('''CREATE TABLE IF NOT EXISTS answers (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         player_db_id INTEGER,
@@ -65,7 +385,7 @@ def setup_database():
         powerup_name TEXT,
         FOREIGN KEY(session_id) REFERENCES sessions(session_id)
     )''')
-    
+
     # [NEW] Moderation Tables
     c.execute('''CREATE TABLE IF NOT EXISTS moderation_logs (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -84,7 +404,31 @@ def setup_database():
         reason TEXT,
         timestamp REAL
     )''')
-    
+
+    # Per-user aggregates for the all-time leaderboard. Kept in sync by the
+    # write jobs that touch players; rebuild_user_totals() recomputes from scratch.
+    c.execute('''CREATE TABLE IF NOT EXISTS user_totals (
+        user_id INTEGER PRIMARY KEY,
+        name TEXT,
+        total_score INTEGER,
+        total_correct INTEGER,
+        total_attempts INTEGER,
+        games_played INTEGER,
+        avg_score REAL,
+        accuracy REAL
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS question_stats (
+        session_id INTEGER,
+        question_index INTEGER,
+        question_key TEXT,
+        question_text TEXT,
+        attempts INTEGER,
+        correct_count INTEGER,
+        time_sum REAL,
+        PRIMARY KEY (session_id, question_index)
+    )''')
+
     # Migrations for existing DBs
     try: c.execute("ALTER TABLE answers ADD COLUMN chosen_text TEXT")
     except: pass
@@ -92,115 +436,145 @@ def setup_database():
     except: pass
     try: c.execute("ALTER TABLE sessions ADD COLUMN results_sent INTEGER DEFAULT 0")
     except: pass
-    
-    conn.commit()
-    conn.close()
+    try: c.execute("ALTER TABLE answers ADD COLUMN question_key TEXT")
+    except: pass
+
+    for stmt in INDEXES:
+        c.execute(stmt)
+    for name in RETIRED_INDEXES:
+        c.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # First run with the aggregate table: backfill it from existing history
+    if c.execute("SELECT 1 FROM user_totals LIMIT 1").fetchone() is None:
+        _rebuild_user_totals(c)
+    if c.execute("SELECT 1 FROM question_stats LIMIT 1").fetchone() is None:
+        _rebuild_question_stats(c)
 
 setup_database()
 
-def save_full_report(session_obj, global_stats, powerup_logs):
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''INSERT INTO sessions (quiz_name, date_played, total_questions, total_players, completion_rate, avg_accuracy, results_sent)
-                 VALUES (?, ?, ?, ?, ?, ?, 0)''', 
-              (session_obj.quiz.name, time.time(), len(session_obj.quiz.questions), len(session_obj.players), global_stats['completion_rate'], global_stats.get('avg_accuracy', 0.0)))
-    
-    session_db_id = c.lastrowid
-    
-    for p_log in powerup_logs:
-        c.execute("INSERT INTO powerup_usage (session_id, user_id, powerup_name) VALUES (?, ?, ?)", 
-                  (session_db_id, p_log['user_id'], p_log['name']))
+SQL_INSERT_PLAYER = '''INSERT INTO players (session_id, user_id, name, score, rank, correct_count, incorrect_count, unattempted_count, join_time, finish_time, total_time_taken)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+SQL_INSERT_ANSWER = '''INSERT INTO answers (player_db_id, question_index, question_text, chosen_indices, chosen_text, is_correct, time_taken, points_earned, question_key)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+SQL_INSERT_QUESTION_STATS = '''INSERT OR REPLACE INTO question_stats (session_id, question_index, question_key, question_text, attempts, correct_count, time_sum)
+                     VALUES (?, ?, ?, ?, ?, ?, ?)'''
 
+def _dump_indices(chosen):
+    # Same text json.dumps gives for a list of ints, without the encoder overhead per row
+    if all(type(i) is int for i in chosen):
+        return "[" + ", ".join(map(str, chosen)) + "]"
+    return json.dumps(chosen)
+
+def build_report_rows(session_obj, global_stats, powerup_logs):
+    # Snapshot of a finished game as plain row tuples (no session / player db ids
+    # yet). Call it on the event loop: it reads the live session, which answer
+    # handlers mutate there, so it must not run on the writer thread.
+    now = time.time()
+    quiz_name = session_obj.quiz.name
+    total_qs = len(session_obj.quiz.questions)
     sorted_players = sorted(session_obj.players.values(), key=lambda p: p.score, reverse=True)
-    
+
+    player_rows = []
+    answer_rows = []
+    keys = {}
+    q_stats = {}  # q_index -> [key, text, attempts, correct, time_sum]
     for rank, player in enumerate(sorted_players, 1):
-        total_qs = len(session_obj.quiz.questions)
         attempted = len(player.answers_log)
         unattempted = total_qs - attempted
-        
+
         if player.completion_timestamp > 0 and player.join_time > 0:
             total_duration = player.completion_timestamp - player.join_time
         elif attempted > 0 and player.join_time > 0:
-            total_duration = time.time() - player.join_time 
+            total_duration = now - player.join_time 
         else:
             total_duration = 0
-            
-        c.execute('''INSERT INTO players (session_id, user_id, name, score, rank, correct_count, incorrect_count, unattempted_count, join_time, finish_time, total_time_taken)
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                  (session_db_id, player.user_id, player.name, player.score, rank, player.correct_answers, player.incorrect_answers, unattempted, player.join_time, player.completion_timestamp, total_duration))
-        
-        player_db_id = c.lastrowid
-        
+
+        player_rows.append((player.user_id, player.name, player.score, rank, player.correct_answers, player.incorrect_answers, unattempted, player.join_time, player.completion_timestamp, total_duration))
         for log in player.answers_log:
-            chosen_txt = log.get('chosen_text', "")
-            c.execute('''INSERT INTO answers (player_db_id, question_index, question_text, chosen_indices, chosen_text, is_correct, time_taken, points_earned)
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                      (player_db_id, log['q_index'], log['q_text'], json.dumps(log['chosen']), chosen_txt, 1 if log['is_correct'] else 0, log['time'], log['points']))
-            
-    conn.commit()
-    conn.close()
+            q_text = log['q_text']
+            key = keys.get(q_text)
+            if key is None: key = keys[q_text] = question_key(quiz_name, q_text)
+            is_correct = 1 if log['is_correct'] else 0
+            answer_rows.append((player.user_id, log['q_index'], q_text, _dump_indices(log['chosen']), log.get('chosen_text', ""), is_correct, log['time'], log['points'], key))
+            st = q_stats.get(log['q_index'])
+            if st is None: st = q_stats[log['q_index']] = [key, q_text, 0, 0, 0.0]
+            st[2] += 1
+            st[3] += is_correct
+            st[4] += log['time']
+
+    return {
+        "session": (quiz_name, now, total_qs, len(player_rows), global_stats['completion_rate'], global_stats.get('avg_accuracy', 0.0)),
+        "powerups": [(p_log['user_id'], p_log['name']) for p_log in powerup_logs],
+        "players": player_rows,
+        "answers": answer_rows,
+        "question_stats": [(idx, *st) for idx, st in q_stats.items()],
+    }
+
+@write_job
+def save_report_rows(c, report):
+    # Bulk path: one executemany per table instead of one INSERT per player / answer
+    c.execute('''INSERT INTO sessions (quiz_name, date_played, total_questions, total_players, completion_rate, avg_accuracy, results_sent)
+                 VALUES (?, ?, ?, ?, ?, ?, 0)''', report["session"])
+    session_db_id = c.lastrowid
+
+    c.executemany("INSERT INTO powerup_usage (session_id, user_id, powerup_name) VALUES (?, ?, ?)",
+                  [(session_db_id, *r) for r in report["powerups"]])
+    player_rows = report["players"]
+    c.executemany(SQL_INSERT_PLAYER, [(session_db_id, *r) for r in player_rows])
+    c.executemany(SQL_ADD_USER_TOTALS, [(r[0], r[1], r[2], r[4], r[4] + r[5]) for r in player_rows])
+
+    # Recover all player row ids at once (user_id is unique within a session)
+    c.execute("SELECT id, user_id FROM players WHERE session_id = ?", (session_db_id,))
+    db_ids = {row['user_id']: row['id'] for row in c.fetchall()}
+    c.executemany(SQL_INSERT_ANSWER, [(db_ids[r[0]], *r[1:]) for r in report["answers"]])
+    c.executemany(SQL_INSERT_QUESTION_STATS, [(session_db_id, *r) for r in report["question_stats"]])
     return session_db_id
 
+def save_full_report(session_obj, global_stats, powerup_logs):
+    # Blocking build + write, for scripts; the bot builds on the loop and awaits aio.save_report_rows
+    return save_report_rows(build_report_rows(session_obj, global_stats, powerup_logs))
+
 def check_results_sent(session_id):
-    conn = get_connection()
-    c = conn.cursor()
+    c = _read_conn().cursor()
     c.execute("SELECT results_sent FROM sessions WHERE session_id = ?", (session_id,))
     res = c.fetchone()
-    conn.close()
     return bool(res['results_sent']) if res else False
 
-def mark_results_sent(session_id):
-    conn = get_connection()
-    c = conn.cursor()
+@write_job
+def mark_results_sent(c, session_id):
     c.execute("UPDATE sessions SET results_sent = 1 WHERE session_id = ?", (session_id,))
-    conn.commit()
-    conn.close()
 
 def get_total_session_count():
-    conn = get_connection()
-    c = conn.cursor()
+    c = _read_conn().cursor()
     c.execute("SELECT COUNT(*) FROM sessions")
     res = c.fetchone()
     count = res[0] if res else 0
-    conn.close()
     return count
 
-def get_session_ids_by_limit(limit_str):
-    conn = get_connection()
-    c = conn.cursor()
+def get_session_bound(limit_str):
+    # "Last N Quizzes" / "All-Time" -> lowest session_id of the selection, or None
+    # if there are no sessions. Session ids only grow, so "the last N sessions"
+    # is everything from the N-th newest id up (gaps from deletes are fine).
+    c = _read_conn().cursor()
     if limit_str == "All-Time":
-        c.execute("SELECT session_id FROM sessions")
+        c.execute("SELECT MIN(session_id) FROM sessions")
     else:
         try:
             parts = limit_str.split()
             if parts[1] == "Quiz": limit = 1
             else: limit = int(parts[1])
-            c.execute("SELECT session_id FROM sessions ORDER BY session_id DESC LIMIT ?", (limit,))
         except:
-            return []
-    rows = c.fetchall()
-    conn.close()
-    return [r[0] for r in rows]
+            return None
+        c.execute("SELECT MIN(session_id) FROM (SELECT session_id FROM sessions ORDER BY session_id DESC LIMIT ?)", (limit,))
+    return c.fetchone()[0]
 
-def get_leaderboard_data(session_ids):
-    if not session_ids: return []
-    conn = get_connection()
-    c = conn.cursor()
-    placeholder = ",".join("?" for _ in session_ids)
-    
-    # [CHANGE] Added: AND user_id NOT IN (SELECT user_id FROM banned_users)
-    query = f'''
-        SELECT name, SUM(score) as total_score, SUM(correct_count) as total_correct,
-        SUM(correct_count + incorrect_count) as total_attempts, COUNT(session_id) as games_played
-        FROM players 
-        WHERE session_id IN ({placeholder})
-        AND user_id NOT IN (SELECT user_id FROM banned_users)
-        GROUP BY user_id
-    '''
-    c.execute(query, session_ids)
+def get_leaderboard_data(since_id):
+    if since_id is None: return []
+    c = _read_conn().cursor()
+
+    # [CHANGE] Banned users excluded (anti-join on banned_users)
+    c.execute(SQL_LEADERBOARD, (since_id,))
     rows = c.fetchall()
-    conn.close()
     results = []
     for r in rows:
         avg_score = r['total_score'] / r['games_played'] if r['games_played'] > 0 else 0
@@ -208,22 +582,36 @@ def get_leaderboard_data(session_ids):
         results.append({"name": r['name'], "avg_score": int(avg_score), "accuracy": accuracy, "games": r['games_played']})
     return results
 
-def get_roundup_data(session_ids):
-    if not session_ids: return None
-    conn = get_connection()
-    c = conn.cursor()
-    placeholder = ",".join("?" for _ in session_ids)
+LEADERBOARD_TOP_K = 15
+SQL_TOP_USER_TOTALS = '''SELECT t.user_id, t.name, t.total_score, t.avg_score, t.accuracy, t.games_played FROM user_totals t
+        LEFT JOIN banned_users b ON b.user_id = t.user_id
+        WHERE b.user_id IS NULL
+        ORDER BY t.{order} DESC LIMIT ?'''
+
+def get_all_time_leaderboard(limit=LEADERBOARD_TOP_K):
+    # Top-K per sort mode from user_totals (each an index walk), merged so
+    # LeaderboardView can re-sort by any mode without another query.
+    c = _read_conn().cursor()
+    merged = {}
+    for order in ("avg_score", "accuracy", "total_score"):
+        for r in c.execute(SQL_TOP_USER_TOTALS.format(order=order), (limit,)):
+            merged[r['user_id']] = {"name": r['name'], "avg_score": int(r['avg_score']), "accuracy": r['accuracy'], "games": r['games_played']}
+    return list(merged.values())
+
+def get_roundup_data(since_id):
+    if since_id is None: return None
+    c = _read_conn().cursor()
+    bound = (since_id,)
     data = {}
-    c.execute(f"SELECT COUNT(DISTINCT user_id) FROM players WHERE session_id IN ({placeholder})", session_ids)
+    c.execute(SQL_ROUNDUP_UNIQUE_USERS, bound)
     data['unique_users'] = c.fetchone()[0]
-    c.execute(f"SELECT SUM(correct_count + incorrect_count) FROM players WHERE session_id IN ({placeholder})", session_ids)
+    c.execute(SQL_ROUNDUP_ANSWERED, bound)
     res = c.fetchone()[0]
     data['total_questions_answered'] = res if res else 0
-    c.execute(f"SELECT powerup_name, COUNT(*) as cnt FROM powerup_usage WHERE session_id IN ({placeholder}) GROUP BY powerup_name ORDER BY cnt DESC LIMIT 1", session_ids)
+    c.execute(SQL_ROUNDUP_TOP_POWERUP, bound)
     row = c.fetchone()
     data['top_powerup'] = f"{row[0]} ({row[1]} uses)" if row else "None"
-    c.execute(f'''SELECT question_text, AVG(is_correct) as acc FROM answers 
-        WHERE player_db_id IN (SELECT id FROM players WHERE session_id IN ({placeholder})) GROUP BY question_text ORDER BY acc DESC''', session_ids)
+    c.execute(SQL_ROUNDUP_QUESTIONS, bound)
     q_rows = c.fetchall()
     if q_rows:
         easiest = q_rows[0]
@@ -234,30 +622,28 @@ def get_roundup_data(session_ids):
     else:
         data['easiest_q'] = "N/A"
         data['hardest_q'] = "N/A"
-    c.execute(f'''SELECT quiz_name, SUM(total_players) as total_p FROM sessions
-        WHERE session_id IN ({placeholder}) GROUP BY quiz_name ORDER BY total_p DESC LIMIT 1''', session_ids)
+    c.execute(SQL_ROUNDUP_TOP_QUIZ, bound)
     quiz_row = c.fetchone()
     data['most_played_quiz'] = f"{quiz_row[0]} ({quiz_row[1]} plays)" if quiz_row else "N/A"
-    conn.close()
     return data
 
 def get_recent_sessions(limit=10):
-    return get_history_page(limit, 0)
+    return get_history_page(limit)[0]
 
-def get_history_page(limit, offset):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT session_id, quiz_name, date_played, total_players, completion_rate, avg_accuracy FROM sessions ORDER BY session_id DESC LIMIT ? OFFSET ?", (limit, offset))
+# Keyset pagination: newest first, the cursor is the last session_id shown.
+# One extra row is fetched to know whether an older page exists.
+SQL_HISTORY_PAGE = '''SELECT session_id, quiz_name, date_played, total_players, completion_rate, avg_accuracy FROM sessions
+        WHERE session_id < ? ORDER BY session_id DESC LIMIT ?'''
+
+def get_history_page(limit, before_id=None):
+    # Returns (rows, has_more). Pass rows[-1]['session_id'] as before_id for the next page.
+    c = _read_conn().cursor()
+    c.execute(SQL_HISTORY_PAGE, (before_id if before_id is not None else 2**63 - 1, limit + 1))
     rows = c.fetchall()
-    conn.close()
-    return rows
+    return rows[:limit], len(rows) > limit
 
 def get_session_lookup(limit=25):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT session_id, quiz_name, date_played, total_players FROM sessions ORDER BY session_id DESC LIMIT ?", (limit,))
-    rows = c.fetchall()
-    conn.close()
+    rows, _ = get_history_page(limit)
     results = []
     for r in rows:
         date_str = time.strftime("%Y-%m-%d %H:%M", time.localtime(r['date_played']))
@@ -265,162 +651,132 @@ def get_session_lookup(limit=25):
         results.append({'id': r['session_id'], 'label': label})
     return results
 
+class MockPlayer:
+    # Read-only stand-in for a Player, rebuilt from the history DB
+    def __init__(self, row):
+        self.user_id = row['user_id']
+        self.name = row['name']
+        self.score = row['score']
+        self.correct_answers = row['correct_count']
+        self.incorrect_answers = row['incorrect_count']
+        self.total_time = row['total_time_taken']
+        self.avatar_url = "" 
+        self.answers_log = []
+
 def get_session_details(session_id):
-    conn = get_connection()
-    c = conn.cursor()
+    c = _read_conn().cursor()
     c.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,))
     row = c.fetchone()
     if not row: 
-        conn.close()
         return None, None, None
     session = dict(row)
-    
-    # [CHANGE] Added: AND user_id NOT IN (SELECT user_id FROM banned_users)
-    c.execute("SELECT * FROM players WHERE session_id = ? AND user_id NOT IN (SELECT user_id FROM banned_users) ORDER BY score DESC", (session_id,))
-    players_data = c.fetchall()
-    
-    class MockPlayer:
-        def __init__(self, row):
-            self.user_id = row['user_id']
-            self.name = row['name']
-            self.score = row['score']
-            self.correct_answers = row['correct_count']
-            self.incorrect_answers = row['incorrect_count']
-            self.total_time = row['total_time_taken']
-            self.avatar_url = "" 
-            self.answers_log = []
-    players = []
-    for p_row in players_data:
-        p_obj = MockPlayer(p_row)
-        c.execute("SELECT * FROM answers WHERE player_db_id = ?", (p_row['id'],))
-        ans_rows = c.fetchall()
-        for a in ans_rows:
-            p_obj.answers_log.append({
-                "q_index": a['question_index'],
-                "is_correct": bool(a['is_correct']),
-                "time": a['time_taken'],
-                "chosen_text": a['chosen_text']
-            })
-        players.append(p_obj)
-    q_analytics = get_question_analytics(session_id)
-    conn.close()
-    return session, players, q_analytics
 
-def get_question_analytics(session_id):
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # [CHANGE] Added: AND p.user_id NOT IN (SELECT user_id FROM banned_users)
-    query = '''SELECT a.question_index, a.question_text, a.is_correct, a.time_taken, a.chosen_text, p.name 
-        FROM answers a 
-        JOIN players p ON a.player_db_id = p.id 
-        WHERE p.session_id = ? 
-        AND p.user_id NOT IN (SELECT user_id FROM banned_users)
-        ORDER BY a.question_index'''
-        
-    c.execute(query, (session_id,))
-    rows = c.fetchall()
-    conn.close()
+    # Stream the joined rows once, filling player logs and question analytics together
+    # [CHANGE] Banned users are excluded
+    banned = load_bans()
+    players = []
     analytics = {}
-    for r in rows:
+    p_obj = None
+    current_id = None
+    for r in c.execute(SQL_SESSION_REPORT, (session_id,)):
+        if r['user_id'] in banned: continue
+        if r['player_db_id'] != current_id:
+            current_id = r['player_db_id']
+            p_obj = MockPlayer(r)
+            players.append(p_obj)
         idx = r['question_index']
-        if idx not in analytics:
-            analytics[idx] = {"text": r['question_text'], "total_time": 0, "count": 0, "correct_count": 0, "responses": []}
-        data = analytics[idx]
+        if idx is None: continue  # player with no answers
+        is_correct = bool(r['is_correct'])
+        p_obj.answers_log.append({
+            "q_index": idx,
+            "is_correct": is_correct,
+            "time": r['time_taken'],
+            "chosen_text": r['chosen_text']
+        })
+        data = analytics.get(idx)
+        if data is None:
+            data = analytics[idx] = {"text": r['question_text'], "total_time": 0, "count": 0, "correct_count": 0, "responses": []}
         data["total_time"] += r['time_taken']
         data["count"] += 1
-        if r['is_correct']: data["correct_count"] += 1
-        data["responses"].append({"player": r['name'], "answer": r['chosen_text'], "correct": bool(r['is_correct']), "time": r['time_taken']})
-    return analytics
+        if is_correct: data["correct_count"] += 1
+        data["responses"].append({"player": r['name'], "answer": r['chosen_text'], "correct": is_correct, "time": r['time_taken']})
+    q_analytics = {idx: analytics[idx] for idx in sorted(analytics)}
+    return session, players, q_analytics
 
-def delete_session(session_id):
-    conn = get_connection()
-    c = conn.cursor()
+@write_job
+def delete_session(c, session_id):
+    user_ids = _session_user_ids(c, session_id, session_id)
     # Delete dependent rows first (Foreign Keys)
-    c.execute("DELETE FROM answers WHERE player_db_id IN (SELECT id FROM players WHERE session_id = ?)", (session_id,))
+    c.execute(SQL_DELETE_SESSION_ANSWERS, (session_id,))
     c.execute("DELETE FROM players WHERE session_id = ?", (session_id,))
     c.execute("DELETE FROM powerup_usage WHERE session_id = ?", (session_id,))
+    c.execute("DELETE FROM question_stats WHERE session_id = ?", (session_id,))
     c.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
-    conn.commit()
-    conn.close()
+    _recompute_user_totals(c, user_ids)
 
-def delete_sessions_range(start_id, end_id):
-    conn = get_connection()
-    c = conn.cursor()
-    
+@write_job
+def delete_sessions_range(c, start_id, end_id):
     # Handle reverse inputs
     low = min(start_id, end_id)
     high = max(start_id, end_id)
-    
+
+    user_ids = _session_user_ids(c, low, high)
+
     # Delete dependent rows in batch
-    c.execute("DELETE FROM answers WHERE player_db_id IN (SELECT id FROM players WHERE session_id BETWEEN ? AND ?)", (low, high))
+    c.execute(SQL_DELETE_RANGE_ANSWERS, (low, high))
     c.execute("DELETE FROM players WHERE session_id BETWEEN ? AND ?", (low, high))
     c.execute("DELETE FROM powerup_usage WHERE session_id BETWEEN ? AND ?", (low, high))
-    
+    c.execute("DELETE FROM question_stats WHERE session_id BETWEEN ? AND ?", (low, high))
+
     # Delete sessions
     c.execute("DELETE FROM sessions WHERE session_id BETWEEN ? AND ?", (low, high))
     deleted_count = c.rowcount
-    
-    conn.commit()
-    conn.close()
+    _recompute_user_totals(c, user_ids)
     return deleted_count
 
 # --- MODERATION FUNCTIONS ---
 
-def log_moderation_action(user_id, user_name, admin_id, action_type, reason, quiz_name):
-    conn = get_connection()
-    c = conn.cursor()
+@write_job
+def log_moderation_action(c, user_id, user_name, admin_id, action_type, reason, quiz_name):
     c.execute("INSERT INTO moderation_logs (user_id, user_name, admin_id, action_type, reason, quiz_name, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
               (user_id, user_name, admin_id, action_type, reason, quiz_name, time.time()))
-    conn.commit()
-    conn.close()
 
-def ban_user_db(user_id, admin_id, reason):
-    conn = get_connection()
-    c = conn.cursor()
+# Ban registry: banned_users mirrored in memory. Loaded once (open_db), kept in
+# sync by ban/unban after their commit, so check_is_banned never hits the DB.
+_banned_ids = None
+
+def load_bans(force=False):
+    global _banned_ids
+    if _banned_ids is None or force:
+        c = _read_conn().cursor()
+        _banned_ids = {row[0] for row in c.execute("SELECT user_id FROM banned_users")}
+    return _banned_ids
+
+@write_job
+def ban_user_db(c, user_id, admin_id, reason):
     c.execute("INSERT OR REPLACE INTO banned_users (user_id, admin_id, reason, timestamp) VALUES (?, ?, ?, ?)",
               (user_id, admin_id, reason, time.time()))
-    conn.commit()
-    conn.close()
+    after_commit(lambda: load_bans().add(user_id))
 
-def unban_user_db(user_id):
-    conn = get_connection()
-    c = conn.cursor()
+@write_job
+def unban_user_db(c, user_id):
     c.execute("DELETE FROM banned_users WHERE user_id = ?", (user_id,))
-    conn.commit()
-    conn.close()
+    after_commit(lambda: load_bans().discard(user_id))
 
 def check_is_banned(user_id):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT 1 FROM banned_users WHERE user_id = ?", (user_id,))
-    res = c.fetchone()
-    conn.close()
-    return bool(res)
+    return user_id in load_bans()
 
 def get_moderation_history(limit=25):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT * FROM moderation_logs ORDER BY timestamp DESC LIMIT ?", (limit,))
+    c = _read_conn().cursor()
+    c.execute(SQL_MODERATION_HISTORY, (limit,))
     rows = c.fetchall()
-    conn.close()
     return rows
 
 def get_user_last_quiz_stats(user_id):
-    conn = get_connection()
-    c = conn.cursor()
+    c = _read_conn().cursor()
     # [CHANGE] Add 'AND p.unattempted_count = 0' to ensure we only get completed quizzes
-    query = '''
-        SELECT p.score, p.rank, p.correct_count, s.quiz_name, s.total_questions
-        FROM players p
-        JOIN sessions s ON p.session_id = s.session_id
-        WHERE p.user_id = ? AND p.unattempted_count = 0
-        ORDER BY s.date_played DESC
-        LIMIT 1
-    '''
-    c.execute(query, (user_id,))
+    c.execute(SQL_USER_LAST_STATS, (user_id,))
     row = c.fetchone()
-    conn.close()
     
     if not row: return None
     
@@ -434,56 +790,88 @@ def get_user_last_quiz_stats(user_id):
         "accuracy": accuracy,
         "quiz_name": row['quiz_name']
     }
-def adjust_session_question(session_id, question_index, new_points, count_as_correct=True):
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # 1. Get all players in this session
-    c.execute("SELECT id FROM players WHERE session_id = ?", (session_id,))
-    player_rows = c.fetchall()
-    player_ids = [row['id'] for row in player_rows]
-    
-    if not player_ids:
-        conn.close()
+SQL_RECOMPUTE_SESSION_PLAYERS = '''UPDATE players SET
+            score = COALESCE((SELECT SUM(points_earned) FROM answers WHERE player_db_id = players.id), 0),
+            correct_count = (SELECT COUNT(*) FROM answers WHERE player_db_id = players.id AND is_correct = 1),
+            incorrect_count = (SELECT COUNT(*) FROM answers WHERE player_db_id = players.id AND is_correct = 0)
+        WHERE session_id = ?'''
+
+@write_job
+def adjust_session_question(c, session_id, question_index, new_points, count_as_correct=True):
+    # question_index: one index or a list of them (/fix_score "3,5").
+    # Set-based: one UPDATE on answers, one on players, one user_totals refresh.
+    q_indices = sorted(set([question_index] if isinstance(question_index, int) else question_index))
+    if not q_indices:
         return 0
-        
-    # 2. Update Answers Table
-    # Filter by question index AND player IDs belonging to this session
-    if len(player_ids) == 1:
-        player_id_str = f"({player_ids[0]})"
-    else:
-        player_id_str = str(tuple(player_ids))
-        
-    query = f'''
-        UPDATE answers 
-        SET points_earned = ?, is_correct = ?
-        WHERE question_index = ? AND player_db_id IN {player_id_str}
-    '''
-    
+    placeholder = ",".join("?" for _ in q_indices)
+
     # Force correctness to 1 (True) or 0 (False)
     is_correct_val = 1 if count_as_correct else 0
-    
-    c.execute(query, (new_points, is_correct_val, question_index))
+
+    c.execute(f'''UPDATE answers SET points_earned = ?, is_correct = ?
+                  WHERE question_index IN ({placeholder})
+                  AND player_db_id IN (SELECT id FROM players WHERE session_id = ?)''',
+              (new_points, is_correct_val, *q_indices, session_id))
     affected_rows = c.rowcount
-    
-    # 3. Recalculate Player Totals (Consistency Check)
-    for pid in player_ids:
-        # Recalculate Score
-        c.execute("SELECT SUM(points_earned) FROM answers WHERE player_db_id = ?", (pid,))
-        total_score = c.fetchone()[0] or 0
-        
-        # Recalculate Correct Count
-        c.execute("SELECT COUNT(*) FROM answers WHERE player_db_id = ? AND is_correct = 1", (pid,))
-        correct = c.fetchone()[0] or 0
-        
-        # Recalculate Incorrect Count
-        c.execute("SELECT COUNT(*) FROM answers WHERE player_db_id = ? AND is_correct = 0", (pid,))
-        incorrect = c.fetchone()[0] or 0
-        
-        # Update Player Record
-        c.execute("UPDATE players SET score = ?, correct_count = ?, incorrect_count = ? WHERE id = ?", 
-                  (total_score, correct, incorrect, pid))
-                  
-    conn.commit()
-    conn.close()
-    return affected_rows
\ No newline at end of file
+    if affected_rows <= 0:
+        return 0
+
+    # Recalculate Player Totals for the whole session (Consistency Check)
+    c.execute(SQL_RECOMPUTE_SESSION_PLAYERS, (session_id,))
+    _recompute_question_stats(c, session_id)
+    _recompute_user_totals(c, _session_user_ids(c, session_id, session_id))
+    return affected_rows
+
+# --- QUERY PLAN CHECK ---
+# (name, sql, sample params, tables that are allowed to be full-scanned)
+QUERY_PLAN_CHECKS = (
+    ("leaderboard", SQL_LEADERBOARD, (1,), set()),
+    ("roundup.unique_users", SQL_ROUNDUP_UNIQUE_USERS, (1,), set()),
+    ("roundup.answered", SQL_ROUNDUP_ANSWERED, (1,), set()),
+    ("roundup.top_powerup", SQL_ROUNDUP_TOP_POWERUP, (1,), set()),
+    ("roundup.questions", SQL_ROUNDUP_QUESTIONS, (1,), set()),
+    ("roundup.top_quiz", SQL_ROUNDUP_TOP_QUIZ, (1,), set()),
+    ("session_details", SQL_SESSION_REPORT, (1,), set()),
+    ("user_last_quiz_stats", SQL_USER_LAST_STATS, (1,), set()),
+    ("moderation_history", SQL_MODERATION_HISTORY, (25,), set()),
+    ("history_page", SQL_HISTORY_PAGE, (100, 26), set()),
+    ("all_time_leaderboard.avg", SQL_TOP_USER_TOTALS.format(order="avg_score"), (15,), set()),
+    ("all_time_leaderboard.accuracy", SQL_TOP_USER_TOTALS.format(order="accuracy"), (15,), set()),
+    ("all_time_leaderboard.total", SQL_TOP_USER_TOTALS.format(order="total_score"), (15,), set()),
+    ("user_totals.recompute", SQL_RECOMPUTE_USER_TOTALS.format(where="WHERE user_id IN (?)"), (1,), set()),
+    ("delete_session.answers", SQL_DELETE_SESSION_ANSWERS, (1,), set()),
+    ("delete_range.answers", SQL_DELETE_RANGE_ANSWERS, (1, 2), set()),
+    ("delete_range.players", "DELETE FROM players WHERE session_id BETWEEN ? AND ?", (1, 2), set()),
+    ("delete_range.powerups", "DELETE FROM powerup_usage WHERE session_id BETWEEN ? AND ?", (1, 2), set()),
+    ("adjust.answers", "UPDATE answers SET points_earned = 0 WHERE question_index IN (?) AND player_db_id IN (SELECT id FROM players WHERE session_id = ?)", (1, 1), set()),
+    ("adjust.players", SQL_RECOMPUTE_SESSION_PLAYERS, (1,), set()),
+    ("adjust.question_stats", SQL_RECOMPUTE_QUESTION_STATS.format(where="WHERE p.session_id = ?"), (1,), set()),
+)
+
+def check_query_plans():
+    # Runs EXPLAIN QUERY PLAN for each known query. Returns a list of
+    # {"name", "plan", "ok"}; ok is False when a table outside the allow-list is SCANned.
+    c = _read_conn().cursor()
+    report = []
+    for name, sql, params, allowed_scans in QUERY_PLAN_CHECKS:
+        rows = c.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        details = [r['detail'] for r in rows]
+        scans = []
+        for detail in details:
+            if detail.startswith("SCAN ") and "USING" not in detail:
+                table = detail.split()[1]
+                if table not in allowed_scans: scans.append(table)
+        report.append({"name": name, "plan": details, "ok": not scans})
+    return report
+
+if __name__ == "__main__":
+    import sys
+    cmd = sys.argv[1] if len(sys.argv) > 1 else None
+    if cmd == "rebuild-totals":
+        print(f"Rebuilt user_totals for {rebuild_user_totals()} users")
+    elif cmd == "rebuild-question-stats":
+        print(f"Rebuilt question_stats ({rebuild_question_stats()} rows)")
+    else:
+        print("Usage: python -m utils.db_manager rebuild-totals | rebuild-question-stats")
+        sys.exit(1)
+    close_db()
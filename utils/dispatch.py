@@ -0,0 +1,123 @@
+import asyncio
+import time
+from collections import deque
+
+# Fire-and-forget edit queue for Discord messages. Callers hand over a key
+# (one per message) and a zero-arg coroutine factory and return immediately.
+#   - Coalescing: at most one pending edit per key. A newer submit replaces the
+#     pending one (last writer wins), so overlapping broadcasts cost one edit.
+#     The factory should render at send time so it always sends the latest state.
+#   - One edit in flight per key, at most `limit` in flight overall.
+#   - priority=True edits go ahead of everything queued without it.
+#   - final=True marks an edit that must land (e.g. a state transition with a new
+#     view). It implies priority and is never replaced by a later non-final
+#     edit for the same key; those are dropped while it is pending.
+#   - 429s are retried after the bucket's reset time (unless a newer edit for
+#     that key has been queued meanwhile, which then goes instead - a final
+#     edit is only superseded by another final one).
+# Latency is measured from the first submit of a pending edit to the end of its
+# send, so the stats show how far behind the queue is.
+
+DEFAULT_RETRY_AFTER = 1.0
+
+def _retry_after(exc):
+    # discord.HTTPException with status 429 -> seconds to wait, else None
+    if getattr(exc, "status", None) != 429: return None
+    delay = getattr(exc, "retry_after", None)
+    if delay is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        delay = headers.get("X-RateLimit-Reset-After") or headers.get("Retry-After")
+    try: return max(0.0, float(delay))
+    except (TypeError, ValueError): return DEFAULT_RETRY_AFTER
+
+class EditQueue:
+    def __init__(self, limit: int = 8, max_retries: int = 3):
+        self.limit = limit
+        self.max_retries = max_retries
+        self._pending = {}        # key -> (make_coro, priority, queued_at, attempt, final)
+        self._urgent = deque()    # keys with a priority edit pending
+        self._ready = deque()
+        self._inflight = set()
+        self._tasks = set()
+        self.stats = {"submitted": 0, "coalesced": 0, "dropped": 0, "sent": 0, "failed": 0, "retried": 0,
+                      "max_pending": 0, "last_latency_ms": 0.0, "max_latency_ms": 0.0, "total_latency_ms": 0.0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + len(self._inflight)
+
+    def submit(self, key, make_coro, priority: bool = False, final: bool = False):
+        self.stats["submitted"] += 1
+        priority = priority or final
+        old = self._pending.get(key)
+        if old and old[4] and not final:
+            self.stats["dropped"] += 1
+            return
+        if old:
+            self.stats["coalesced"] += 1
+            priority = priority or old[1]
+            self._pending[key] = (make_coro, priority, old[2], 0, final)
+            if priority and not old[1] and key not in self._inflight: self._urgent.append(key)
+        else:
+            self._pending[key] = (make_coro, priority, time.perf_counter(), 0, final)
+            if key not in self._inflight: self._enqueue(key, priority)
+        self.stats["max_pending"] = max(self.stats["max_pending"], self.pending)
+        self._pump()
+
+    def _enqueue(self, key, priority):
+        (self._urgent if priority else self._ready).append(key)
+
+    def _next_key(self):
+        for dq in (self._urgent, self._ready):
+            while dq:
+                key = dq.popleft()
+                if key in self._pending and key not in self._inflight: return key
+        return None
+
+    def _pump(self):
+        while len(self._inflight) < self.limit:
+            key = self._next_key()
+            if key is None: break
+            job = self._pending.pop(key)
+            self._inflight.add(key)
+            task = asyncio.get_running_loop().create_task(self._send(key, job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _retry(self, key, job):
+        newer = self._pending.get(key)
+        if newer and (newer[4] or not job[4]): return  # superseded by a newer edit
+        self._pending[key] = job
+        if key not in self._inflight: self._enqueue(key, job[1])
+        self._pump()
+
+    async def _send(self, key, job):
+        make_coro, priority, queued_at, attempt, final = job
+        retry_in = None
+        try:
+            await make_coro()
+            self.stats["sent"] += 1
+        except Exception as e:
+            retry_in = _retry_after(e)
+            if retry_in is not None and attempt < self.max_retries:
+                self.stats["retried"] += 1
+            else:
+                retry_in = None
+                self.stats["failed"] += 1
+        finally:
+            self._inflight.discard(key)
+            if retry_in is not None:
+                asyncio.get_running_loop().call_later(retry_in, self._retry, key, (make_coro, priority, queued_at, attempt + 1, final))
+            else:
+                latency = (time.perf_counter() - queued_at) * 1000
+                self.stats["last_latency_ms"] = latency
+                self.stats["max_latency_ms"] = max(self.stats["max_latency_ms"], latency)
+                self.stats["total_latency_ms"] += latency
+            # A newer edit arrived while this one was in flight
+            if key in self._pending: self._enqueue(key, self._pending[key][1])
+            self._pump()
+
+    def get_stats(self) -> dict:
+        done = self.stats["sent"] + self.stats["failed"]
+        return {**self.stats, "pending": self.pending,
+                "avg_latency_ms": self.stats["total_latency_ms"] / done if done else 0.0}
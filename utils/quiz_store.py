@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+# Single-file quiz store: every quiz lives as one row in data/quiz_store.db,
+# indexed by filename (primary key) and name. Enabled with QUIZ_STORAGE=sqlite;
+# data_manager keeps the same load/save/lookup/delete API in both modes.
+# Bulk import/export to the one-JSON-per-quiz layout:
+#   python -m utils.quiz_store import [data/quizzes]
+#   python -m utils.quiz_store export [data/quizzes]
+STORE_FILE = os.path.join("data", "quiz_store.db")
+
+_conn = None
+_lock = threading.RLock()
+_last_data_version = None
+
+def get_connection():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(STORE_FILE), exist_ok=True)
+        _conn = sqlite3.connect(STORE_FILE, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute('''CREATE TABLE IF NOT EXISTS quizzes (
+            filename TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            creator_id INTEGER,
+            question_count INTEGER,
+            updated_at REAL,
+            data TEXT NOT NULL
+        )''')
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_quizzes_name ON quizzes(name)")
+        _conn.commit()
+    return _conn
+
+def close():
+    global _conn, _last_data_version
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+            _last_data_version = None
+
+def has_changed() -> bool:
+    # PRAGMA data_version only moves when ANOTHER connection commits (e.g. the
+    # import script), so our own writes never force a catalog rescan.
+    global _last_data_version
+    with _lock:
+        version = get_connection().execute("PRAGMA data_version").fetchone()[0]
+        changed = version != _last_data_version
+        _last_data_version = version
+        return changed
+
+def list_entries():
+    with _lock:
+        c = get_connection().execute(
+            "SELECT filename, name, question_count, updated_at, length(data) AS size FROM quizzes")
+        return c.fetchall()
+
+def get_data(filename: str):
+    with _lock:
+        row = get_connection().execute("SELECT data FROM quizzes WHERE filename = ?", (filename,)).fetchone()
+    return json.loads(row['data']) if row else None
+
+def put(filename: str, data: dict):
+    payload = json.dumps(data)
+    updated_at = time.time()
+    with _lock:
+        conn = get_connection()
+        conn.execute('''INSERT INTO quizzes (filename, name, creator_id, question_count, updated_at, data)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(filename) DO UPDATE SET
+                            name = excluded.name, creator_id = excluded.creator_id,
+                            question_count = excluded.question_count,
+                            updated_at = excluded.updated_at, data = excluded.data''',
+                     (filename, data['name'], data.get('creator_id'), len(data.get('questions', [])), updated_at, payload))
+        conn.commit()
+    return updated_at, len(payload)
+
+def delete(filename: str) -> bool:
+    with _lock:
+        conn = get_connection()
+        c = conn.execute("DELETE FROM quizzes WHERE filename = ?", (filename,))
+        conn.commit()
+        return c.rowcount > 0
+
+# --- BULK IMPORT / EXPORT ---
+
+def import_json_dir(quiz_dir: str) -> int:
+    count = 0
+    rows = []
+    for filename in sorted(os.listdir(quiz_dir)):
+        if not filename.endswith(".json"): continue
+        try:
+            with open(os.path.join(quiz_dir, filename), 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        rows.append((filename, data['name'], data.get('creator_id'), len(data.get('questions', [])), time.time(), json.dumps(data)))
+        count += 1
+    with _lock:
+        conn = get_connection()
+        conn.executemany("INSERT OR REPLACE INTO quizzes (filename, name, creator_id, question_count, updated_at, data) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+    return count
+
+def export_json_dir(quiz_dir: str) -> int:
+    os.makedirs(quiz_dir, exist_ok=True)
+    count = 0
+    with _lock:
+        rows = get_connection().execute("SELECT filename, data FROM quizzes").fetchall()
+    for row in rows:
+        with open(os.path.join(quiz_dir, row['filename']), 'w') as f:
+            json.dump(json.loads(row['data']), f, indent=4)
+        count += 1
+    return count
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python -m utils.quiz_store import|export [quiz_dir]")
+        sys.exit(1)
+    target_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join("data", "quizzes")
+    if sys.argv[1] == "import":
+        print(f"Imported {import_json_dir(target_dir)} quizzes into {STORE_FILE}")
+    else:
+        print(f"Exported {export_json_dir(target_dir)} quizzes to {target_dir}")
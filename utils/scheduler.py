@@ -0,0 +1,78 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+# Deadline scheduler: a min-heap of (when, seq, key). schedule() replaces any
+# earlier deadline for the same key and cancel() drops it; stale heap entries
+# are skipped lazily when they reach the top. run() sleeps until the earliest
+# live deadline (or until an earlier one is scheduled) and hands the handler
+# only the keys that are due, so idle time costs nothing and each wake-up is
+# O(expired log n) instead of a scan over everything that could expire.
+
+class DeadlineScheduler:
+    def __init__(self):
+        self._heap = []
+        self._live = {}   # key -> heap entry currently in force
+        self._seq = itertools.count()
+        self._wake = None
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, key):
+        return key in self._live
+
+    def schedule(self, key, when: float):
+        entry = (when, next(self._seq), key)
+        self._live[key] = entry
+        heapq.heappush(self._heap, entry)
+        # Mostly stale entries (reschedules): rebuild instead of letting the heap grow
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+        if self._wake and self._heap[0] is entry:
+            self._wake.set()
+
+    def cancel(self, key):
+        self._live.pop(key, None)
+
+    def deadline(self, key):
+        entry = self._live.get(key)
+        return entry[0] if entry else None
+
+    def _skip_stale(self):
+        heap = self._heap
+        while heap and self._live.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+
+    def next_deadline(self):
+        self._skip_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float):
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._live.get(entry[2]) is entry:
+                del self._live[entry[2]]
+                due.append(entry[2])
+        return due
+
+    async def run(self, handler):
+        # handler(due_keys) is awaited on every wake-up that has due keys
+        self._wake = asyncio.Event()
+        try:
+            while True:
+                nxt = self.next_deadline()
+                timeout = None if nxt is None else max(0.0, nxt - time.time())
+                self._wake.clear()
+                try: await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError: pass
+                due = self.pop_due(time.time())
+                if due:
+                    try: await handler(due)
+                    except Exception as e: print(f"Deadline handler failed: {e}")
+        finally:
+            self._wake = None